@@ -6,66 +6,132 @@
     python compare_output.py <original_file.c> <new_file.c>
 """
 
+import os
 import sys
-import re
+import copy
+import mmap
+import functools
+from itertools import islice
 from pathlib import Path
 
+# 正则后端: 优先使用 google-re2 (线性时间, 无回溯), 未安装时回退到标准库 re
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+
+
+# 预编译的正则表达式 (模块级缓存, 避免每次调用重复编译)
+# 模式均为 bytes, 直接在 mmap 上匹配, 无需 UTF-8 解码
+_RE_LINE_HEIGHT = _re.compile(rb'\.line_height\s*=\s*(\d+)')
+_RE_BASE_LINE = _re.compile(rb'\.base_line\s*=\s*(-?\d+)')
+_RE_BPP = _re.compile(rb'\.bpp\s*=\s*(\d+)')
+_RE_GLYPH_CNT = _re.compile(rb'glyph_cnt\s*=\s*(\d+)')
+_RE_CMAPS_BODY = _re.compile(rb'cmaps\[\]\s*=\s*\{([\s\S]+?)\};')
+_RE_CMAP = _re.compile(rb'\.range_start\s*=\s*(\d+),\s*\.range_length\s*=\s*(\d+)')
+_RE_BITMAP_ARR = _re.compile(rb'glyph_bitmap\[\]\s*=\s*\{([\s\S]+?)\};')
+_RE_DSC_ARR = _re.compile(rb'glyph_dsc\[\]\s*=\s*\{([\s\S]+?)\};')
+_RE_HEX_BYTE = _re.compile(rb'(?i)0x([0-9a-f]+)')
+_RE_DSC_ENTRY = _re.compile(rb'\{[^}]+\}')
+
 
 def parse_c_font_file(filepath):
-    """解析 C 字体文件,提取关键数据"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """解析 C 字体文件,提取关键数据
     
+    结果按 (路径, 大小, 修改时间) 缓存, 文件未变化时不会重复解析。
+    返回缓存条目的深拷贝, 调用方修改其中的列表不会影响缓存。
+    """
+    st = os.stat(filepath)
+    return copy.deepcopy(_parse_cached(os.fspath(filepath), st.st_size, st.st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_cached(filepath, size, mtime_ns):
+    """实际的解析逻辑 (size 与 mtime_ns 仅作为缓存键)"""
+    with open(filepath, 'rb') as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法 mmap
+            return {}
+    
+    try:
+        return _parse_content(content)
+    finally:
+        content.close()
+
+
+def _search_field(content, keyword, pattern):
+    """先用子串查找定位关键字, 再在该位置做锚定匹配
+    
+    bytes.find 以 C 速度扫描, 只在命中关键字的位置调用正则,
+    避免每个字段的正则都完整扫描一遍文件。
+    """
+    pos = content.find(keyword)
+    while pos != -1:
+        match = pattern.match(content, pos)
+        if match:
+            return match
+        pos = content.find(keyword, pos + 1)
+    return None
+
+
+def _parse_content(content):
+    """从 C 源码内容 (bytes 或 mmap) 中提取关键数据"""
     data = {}
     
     # 提取字体大小
-    match = re.search(r'\.line_height\s*=\s*(\d+)', content)
+    match = _search_field(content, b'.line_height', _RE_LINE_HEIGHT)
     if match:
         data['line_height'] = int(match.group(1))
     
     # 提取 base_line
-    match = re.search(r'\.base_line\s*=\s*(-?\d+)', content)
+    match = _search_field(content, b'.base_line', _RE_BASE_LINE)
     if match:
         data['base_line'] = int(match.group(1))
     
     # 提取 BPP
-    match = re.search(r'\.bpp\s*=\s*(\d+)', content)
+    match = _search_field(content, b'.bpp', _RE_BPP)
     if match:
         data['bpp'] = int(match.group(1))
     
     # 提取压缩方式
-    if 'LV_FONT_FMT_TXT_COMPRESS_RLE' in content:
+    if content.find(b'LV_FONT_FMT_TXT_COMPRESS_RLE') != -1:
         data['compression'] = 'RLE'
-    elif 'LV_FONT_FMT_TXT_COMPRESS_NONE' in content:
+    elif content.find(b'LV_FONT_FMT_TXT_COMPRESS_NONE') != -1:
         data['compression'] = 'NONE'
     
     # 提取字形数量
-    match = re.search(r'glyph_cnt\s*=\s*(\d+)', content)
+    match = _search_field(content, b'glyph_cnt', _RE_GLYPH_CNT)
     if match:
         data['glyph_count'] = int(match.group(1))
     
-    # 提取 cmap 范围
-    cmap_ranges = re.findall(r'0x([0-9a-f]+),\s*0x([0-9a-f]+)', content, re.IGNORECASE)
-    if cmap_ranges:
-        data['cmap_ranges'] = [(int(start, 16), int(end, 16)) for start, end in cmap_ranges[:5]]  # 前5个
+    # 提取 cmap 范围 (只扫描 cmaps[] 数组体)
+    match = _search_field(content, b'cmaps[]', _RE_CMAPS_BODY)
+    if match:
+        cmap_ranges = [
+            (int(m.group(1)), int(m.group(1)) + int(m.group(2)) - 1)
+            for m in islice(_RE_CMAP.finditer(content, match.start(1), match.end(1)), 5)  # 前5个
+        ]
+        if cmap_ranges:
+            data['cmap_ranges'] = cmap_ranges
     
     # 提取字形位图数据 (前几个字节)
-    match = re.search(r'glyph_bitmap\[\]\s*=\s*\{([\s\S]+?)\};', content)
+    match = _search_field(content, b'glyph_bitmap[]', _RE_BITMAP_ARR)
     if match:
-        bitmap_str = match.group(1)
-        # 提取前20个字节
-        bytes_data = re.findall(r'0x([0-9a-f]+)', bitmap_str, re.IGNORECASE)[:20]
-        data['bitmap_preview'] = [int(b, 16) for b in bytes_data]
+        # 提取前20个字节 (用 pos/endpos 限定范围, 取够即停止扫描)
+        hex_bytes = _RE_HEX_BYTE.finditer(content, match.start(1), match.end(1))
+        data['bitmap_preview'] = [int(m.group(1), 16) for m in islice(hex_bytes, 20)]
     
     # 提取字形描述数据
-    match = re.search(r'glyph_dsc\[\]\s*=\s*\{([\s\S]+?)\};', content)
+    match = _search_field(content, b'glyph_dsc[]', _RE_DSC_ARR)
     if match:
-        dsc_str = match.group(1)
-        # 计算字形描述的数量
-        dsc_entries = re.findall(r'\{[^}]+\}', dsc_str)
-        data['glyph_dsc_count'] = len(dsc_entries)
+        dsc_entries = _RE_DSC_ENTRY.finditer(content, match.start(1), match.end(1))
         # 提取前3个字形描述
-        data['glyph_dsc_preview'] = dsc_entries[:3]
+        preview = [m.group(0).decode('utf-8') for m in islice(dsc_entries, 3)]
+        # 计算字形描述的数量 (剩余条目只计数, 不保留)
+        data['glyph_dsc_count'] = len(preview) + sum(1 for _ in dsc_entries)
+        data['glyph_dsc_preview'] = preview
     
     return data
 
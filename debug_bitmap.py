@@ -45,13 +45,13 @@ if rendered:
     
     # 打印位图 (十六进制)
     for y in range(min(5, rendered.height)):  # 前5行
-        row_hex = ' '.join([f'{val:02x}' for val in rendered.bitmap[y, :]])
-        print(f"  Row {y}: {row_hex}")
+        row_bytes = rendered.bitmap[y, :].astype(np.uint8, copy=False).tobytes()
+        print(f"  Row {y}: {row_bytes.hex(' ')}")
     
     # 第一行前10个像素的打包
     if rendered.height > 0 and rendered.width >= 10:
         first_10 = rendered.bitmap[0, :10]
-        print(f"\n前10个像素: {[f'0x{val:x}' for val in first_10]}")
+        print(f"\n前10个像素: {first_10.astype(np.uint8, copy=False).tobytes().hex(' ')}")
         
         # 手动打包前2个像素
         p0 = first_10[0]
@@ -14,7 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from core.font_loader import FontLoader
 from core.glyph_renderer import GlyphRenderer
 from core.range_parser import RangeParser, get_preset_ranges
-import freetype
+from utils.system_font import resolve_system_font
 
 
 def print_header(title):
@@ -61,12 +61,11 @@ def demo_font_info(font_path):
     return loader
 
 
-def demo_glyph_rendering(font_path):
-    """演示字形渲染"""
+def demo_glyph_rendering(font_path, face):
+    """演示字形渲染 (复用 FontLoader 已打开的 FreeType face)"""
     print_header("字形渲染")
     
     renderer = GlyphRenderer()
-    face = freetype.Face(font_path)
     renderer.set_font_face(font_path, face)
     
     # 测试不同的参数
@@ -162,19 +161,8 @@ def main():
     print("  Version: 0.1.0 (Phase 1 完成)")
     print("🎨" * 30)
     
-    # 查找系统字体
-    possible_fonts = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/TTF/DejaVuSans.ttf",
-        "/System/Library/Fonts/Helvetica.ttc",
-        "/Library/Fonts/Arial.ttf",
-    ]
-    
-    font_path = None
-    for path in possible_fonts:
-        if Path(path).exists():
-            font_path = path
-            break
+    # 查找系统字体 (结果缓存在 ~/.lvfontconv/syspath.txt)
+    font_path = resolve_system_font()
     
     if not font_path:
         print("\n❌ 错误: 未找到系统字体")
@@ -193,8 +181,8 @@ def main():
     
     try:
         # 运行各个演示
-        demo_font_info(font_path)
-        demo_glyph_rendering(font_path)
+        loader = demo_font_info(font_path)
+        demo_glyph_rendering(font_path, loader.get_freetype_face(font_path))
         demo_range_parser()
         
         print_header("演示完成")
@@ -9,24 +9,35 @@ FontConverter 端到端演示
 4. 生成 LVGL C 代码
 """
 
+import os
 import sys
+from itertools import islice
 from pathlib import Path
 
 # 添加 src 到路径
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from core.font_converter import FontConverter, ConversionParams
+from utils.system_font import SYSTEM_FONT_CANDIDATES, resolve_system_font
 
 
 def progress_callback(message: str, current: int, total: int):
-    """进度回调函数"""
+    """进度回调函数 (每个整数百分比最多刷新一次)"""
+    pct = (current * 100 // total) if total > 0 else 0
+    if pct == progress_callback._last and current < total:
+        return
+    progress_callback._last = pct
+    
     percentage = (current / total * 100) if total > 0 else 0
     bar_length = 30
     filled = int(bar_length * current / total) if total > 0 else 0
     bar = "█" * filled + "░" * (bar_length - filled)
-    print(f"\r{message}: [{bar}] {percentage:.1f}%", end="", flush=True)
-    if current >= total:
-        print()  # 换行
+    end = "\n" if current >= total else ""  # 完成时换行
+    sys.stdout.write(f"\r{message}: [{bar}] {percentage:.1f}%{end}")
+    sys.stdout.flush()
+
+
+progress_callback._last = -1
 
 
 def main():
@@ -36,23 +47,13 @@ def main():
     print("=" * 70)
     print()
     
-    # 查找系统字体
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-        "/System/Library/Fonts/Helvetica.ttc",              # macOS
-        "C:\\Windows\\Fonts\\arial.ttf",                    # Windows
-    ]
-    
-    font_path = None
-    for path in font_paths:
-        if Path(path).exists():
-            font_path = path
-            break
+    # 查找系统字体 (结果缓存在 ~/.lvfontconv/syspath.txt)
+    font_path = resolve_system_font()
     
     if not font_path:
         print("❌ 未找到系统字体，请手动指定字体路径")
         print("   可用的字体路径示例：")
-        for p in font_paths:
+        for p in SYSTEM_FONT_CANDIDATES:
             print(f"   - {p}")
         return 1
     
@@ -118,25 +119,30 @@ def main():
         
         # 5. 检查输出文件
         print("📝 步骤 5: 检查输出文件")
-        output_file = Path(output_path).with_suffix('.c')
+        output_file = output_path + '.c'
+        
+        try:
+            file_size = os.stat(output_file).st_size
+        except FileNotFoundError:
+            file_size = None
         
-        if output_file.exists():
-            file_size = output_file.stat().st_size
+        if file_size is not None:
             print(f"   ✓ 文件已生成: {output_file}")
             print(f"   ✓ 文件大小: {file_size:,} 字节 ({file_size / 1024:.1f} KB)")
-            
-            # 读取并显示前几行
-            with open(output_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            print(f"   ✓ 代码行数: {len(lines)}")
             print()
             print("   📄 文件预览 (前 20 行):")
             print("   " + "-" * 66)
-            for i, line in enumerate(lines[:20], 1):
-                print(f"   {i:3d} | {line.rstrip()}")
-            if len(lines) > 20:
-                print(f"   ... (省略剩余 {len(lines) - 20} 行)")
+            
+            # 只读取预览所需的行, 不加载整个文件
+            with open(output_file, 'r', encoding='utf-8') as f:
+                sys.stdout.write(''.join(
+                    f"   {i:3d} | {line.rstrip()}\n"
+                    for i, line in enumerate(islice(f, 20), 1)
+                ))
+                sys.stdout.flush()
+                has_more = f.readline() != ''
+            if has_more:
+                print("   ... (省略剩余内容)")
             print("   " + "-" * 66)
         else:
             print("   ⚠️  输出文件未找到")
@@ -11,14 +11,11 @@ sys.path.insert(0, 'src')
 import numpy as np
 from pathlib import Path
 
-from core.font_loader import FontLoader
-from core.glyph_renderer import GlyphRenderer
 from writers.lvgl.structures import (
     LVGLFont,
     LVGLHead,
     LVGLCmap,
     LVGLGlyf,
-    LVGLKern,
     CmapSubtable,
     GlyphData,
     CompressionType,
@@ -28,6 +25,10 @@ from writers.lvgl.structures import (
 from writers.lvgl.writer import LVGLWriter
 
 
+# 演示用随机位图共享同一个 Generator (PCG64)
+_RNG = np.random.default_rng(0)
+
+
 def demo_lvgl_writer():
     """演示 LVGL Writer 功能"""
     print("=" * 70)
@@ -109,16 +110,17 @@ def demo_lvgl_writer():
     )
     glyf.add_glyph(reserved)
     
+    # 一次性生成全部示例位图, 循环中只取视图
+    digit_bitmaps = _RNG.integers(0, 16, (10, 8, 6), dtype=np.uint8)  # 10 个 6x8
+    letter_bitmaps = _RNG.integers(0, 16, (5, 10, 8), dtype=np.uint8)  # 5 个 8x10
+    
     # 添加数字 0-9 的简化字形
     bitmap_offset = 0
     for i in range(10):
-        # 创建简单的位图 (6x8)
-        bitmap = np.random.randint(0, 16, (8, 6), dtype=np.uint8)
-        
         glyph = GlyphData(
             glyph_id=i + 1,
             unicode=0x30 + i,  # '0' + i
-            bitmap=bitmap,
+            bitmap=digit_bitmaps[i],
             bitmap_index=bitmap_offset,
             advance_width=10.0,
             box_w=6,
@@ -131,12 +133,10 @@ def demo_lvgl_writer():
     
     # 添加字母 A-E
     for i in range(5):
-        bitmap = np.random.randint(0, 16, (10, 8), dtype=np.uint8)
-        
         glyph = GlyphData(
             glyph_id=i + 11,
             unicode=0x41 + i,  # 'A' + i
-            bitmap=bitmap,
+            bitmap=letter_bitmaps[i],
             bitmap_index=bitmap_offset,
             advance_width=12.0,
             box_w=8,
@@ -22,6 +22,21 @@ def get_version():
                 return line.split('=')[1].strip().strip('"\'')
     return '0.1.0'
 
+# Optionally compile pure-Python hot spots with mypyc (LVFONTCONV_MYPYC=1).
+# The compiled extension shadows the .py module; plain installs keep using
+# the pure-Python source.
+MYPYC_MODULES = [
+    'src/core/_range_utils.py',
+]
+
+def get_ext_modules():
+    if os.environ.get('LVFONTCONV_MYPYC') != '1':
+        return []
+    from mypyc.build import mypycify
+    # Modules live under src/ (package_dir), so resolve them from there
+    os.environ.setdefault('MYPYPATH', 'src')
+    return mypycify(['--explicit-package-bases'] + MYPYC_MODULES)
+
 setup(
     name='lvfontconv',
     version=get_version(),
@@ -34,6 +49,7 @@ setup(
     packages=find_packages(),
     package_dir={'': 'src'},
     include_package_data=True,
+    ext_modules=get_ext_modules(),
     install_requires=[
         'PyQt6>=6.4.0',
         'fontTools>=4.38.0',
@@ -50,6 +66,12 @@ setup(
             'flake8>=6.0.0',
             'mypy>=1.0.0',
         ],
+        'fast': [
+            'google-re2>=1.0',
+            'numba>=0.57',
+            'orjson>=3.6',
+        ],
+
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,150 @@
+"""
+字符范围解析
+
+SimpleFontConverter 使用的范围字符串解析和码点收集。单独成模块, 不依赖
+FreeType 和 LVGL 写入器, 仅需解析范围时导入开销很小。
+"""
+
+import array
+import functools
+import re
+import sys
+from typing import Iterable, List, Optional, Set
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# 范围: 0x30-0x39 或 48-57
+_RANGE_RE = re.compile(r'(0x[0-9a-fA-F]+|[0-9]+)\s*-\s*(0x[0-9a-fA-F]+|[0-9]+)')
+
+# 单个字符: 0x41 或 65
+_SINGLE_RE = re.compile(r'(0x[0-9a-fA-F]+|[0-9]+)$')
+
+# "start-end" 形式的范围 (恰好一个 '-'), 用于估算字符数
+_SPAN_RE = re.compile(r'^([^-]*)-([^-]*)$')
+
+# 与 array('I') 本机字节序一致的 UTF-32 编码
+_UTF32_NATIVE = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def _parse_code(s: str) -> int:
+    """解析已由正则校验的十六进制 (0x 前缀) 或十进制数字"""
+    # 不使用 int(s, 0): 它会拒绝带前导零的十进制数 (如 "065")
+    return int(s, 16) if s[1:2] == 'x' else int(s)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_range(range_str: str) -> Iterable[int]:
+    """
+    解析字符范围字符串
+    
+    结果按字符串缓存 (返回值为不可变的 range/元组, 可安全共享),
+    无法解析的字符串只在首次遇到时记录警告。
+    
+    支持格式:
+    - "0x30-0x39" (十六进制范围)
+    - "48-57" (十进制范围)
+    - "0x41" (单个十六进制字符)
+    - "65" (单个十进制字符)
+    
+    Args:
+        range_str: 范围字符串
+        
+    Returns:
+        字符码点序列 (range 对象或单元素元组, 不展开为列表)
+    """
+    range_str = range_str.strip()
+    
+    # 匹配范围: 0x30-0x39 或 48-57
+    match = _RANGE_RE.match(range_str)
+    if match:
+        start_str, end_str = match.groups()
+        return range(_parse_code(start_str), _parse_code(end_str) + 1)
+    
+    # 单个字符: 0x41 或 65
+    match = _SINGLE_RE.match(range_str)
+    if match:
+        return (_parse_code(match.group(1)),)
+    
+    logger.warning(f"无法解析范围字符串: {range_str}")
+    return ()
+
+
+def collect_codepoints(ranges: List[str], symbols: str) -> Set[int]:
+    """
+    收集所有需要转换的字符码点
+    
+    Args:
+        ranges: 范围字符串列表 ["0x30-0x39", "0x41-0x5A"]
+        symbols: 符号字符串 "©®™"
+        
+    Returns:
+        字符码点集合
+    """
+    codepoints: Set[int] = set()
+    
+    # 解析范围
+    for range_str in ranges:
+        codepoints.update(parse_range(range_str))
+    
+    # 添加单独符号: UTF-32 编码后每 4 字节即一个码点, 一次解码, 无逐字符 ord()
+    # (surrogatepass: 与 ord() 一样接受孤立代理项, 如输入框或 JSON 中的 \ud800)
+    if symbols:
+        codepoints.update(array.array('I', symbols.encode(_UTF32_NATIVE, 'surrogatepass')))
+    
+    return codepoints
+
+
+def estimate_char_count(ranges: List[str], symbols: str) -> int:
+    """
+    估算字符数 (范围长度之和加符号个数, 不去重)
+    
+    Args:
+        ranges: 范围字符串列表 ["0x30-0x39", "0x41-0x5A"]
+        symbols: 符号字符串 "©®™"
+        
+    Returns:
+        估算的字符数, 无法解析的范围不计入
+    """
+    count = len(symbols)
+    for r in ranges:
+        match = _SPAN_RE.match(r)
+        if match:
+            try:
+                count += int(match.group(2), 0) - int(match.group(1), 0) + 1
+            except ValueError:
+                pass
+    return count
+
+
+class CharCountCache:
+    """
+    为带 ranges/symbols 字段的数据类缓存估算字符数
+    
+    子类需声明 _char_count 字段 (init=False, 默认 None)。ranges/symbols 被
+    重新赋值时缓存失效, 原地修改 ranges 列表后需调用 recompute_char_count()。
+    """
+    __slots__ = ()
+    
+    _char_count: Optional[int]
+    ranges: List[str]
+    symbols: str
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in ('ranges', 'symbols'):
+            object.__setattr__(self, '_char_count', None)
+    
+    @property
+    def char_count(self) -> int:
+        """估算字符数 (结果缓存)"""
+        if self._char_count is None:
+            self.recompute_char_count()
+        return self._char_count
+    
+    def recompute_char_count(self) -> int:
+        """重新计算并缓存字符数"""
+        count = estimate_char_count(self.ranges, self.symbols)
+        object.__setattr__(self, '_char_count', count)
+        return count
@@ -3,16 +3,22 @@ Font loader module for LVFontConv
 Loads and parses font files (TTF, OTF, WOFF, WOFF2)
 """
 
+import dataclasses
+import mmap
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Set, Optional, Dict, Any
-import freetype
-
-from fontTools.ttLib import TTFont
-from fontTools.pens.boundsPen import BoundsPen
+from typing import TYPE_CHECKING, FrozenSet, List, Optional, Dict, Any, Tuple
 
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    # fontTools and freetype are slow to import; they are loaded on first use
+    import freetype
+    from fontTools.ttLib import TTFont
+
 logger = get_logger()
 
 
@@ -28,7 +34,7 @@ class FontInfo:
     style_name: str
     full_name: str
     glyph_count: int
-    supported_chars: Set[int]
+    supported_chars: FrozenSet[int]
     ascent: int
     descent: int
     units_per_em: int
@@ -44,6 +50,57 @@ class FontInfo:
         )
 
 
+# Font information shared by all loaders, keyed on (path, mtime_ns), so
+# loading the same font again (e.g. to convert it at several sizes) skips
+# re-reading the name and cmap tables. Only FontInfo is shared: TTFont
+# (lazily loaded tables) and FreeType faces (pixel size, glyph slot) are
+# mutable and not thread-safe, so every loader opens its own.
+_INFO_CACHE_SIZE = 32
+_info_cache: 'OrderedDict[Tuple[str, int], FontInfo]' = OrderedDict()
+_info_cache_lock = threading.Lock()
+
+# freetype-py creates every face on one process-wide FT_Library, and
+# FreeType requires face creation and destruction on a library to be
+# serialized. Faces that may be opened from several threads go through
+# open_face() and close_face().
+_ft_library_lock = threading.RLock()
+
+
+def open_face(font_path: str) -> 'freetype.Face':
+    """
+    Open a FreeType face while holding the library lock
+    
+    Args:
+        font_path: Path to font file
+        
+    Returns:
+        New FreeType Face, owned by the caller
+    """
+    import freetype
+    
+    with _ft_library_lock:
+        return freetype.Face(font_path)
+
+
+def close_face(face: 'freetype.Face') -> None:
+    """
+    Release a FreeType face now while holding the library lock
+    
+    The face must not be used afterwards. Closing a face twice is a no-op.
+    
+    Args:
+        face: Face returned by open_face()
+    """
+    import freetype
+    
+    with _ft_library_lock:
+        # freetype-py frees the face in __del__ unless the handle is cleared
+        handle, face._FT_Face = face._FT_Face, None
+        # FT_Done_Face may already be gone when called during interpreter exit
+        if handle is not None and freetype.FT_Done_Face is not None:
+            freetype.FT_Done_Face(handle)
+
+
 class FontLoader:
     """
     Font file loader and parser
@@ -53,8 +110,9 @@ class FontLoader:
     
     def __init__(self):
         """Initialize font loader"""
-        self._loaded_fonts: Dict[str, TTFont] = {}
-        self._freetype_faces: Dict[str, freetype.Face] = {}
+        self._loaded_fonts: Dict[str, 'TTFont'] = {}
+        self._freetype_faces: Dict[str, 'freetype.Face'] = {}
+        self._mmaps: Dict[str, mmap.mmap] = {}
     
     def load_font(self, font_path: str) -> FontInfo:
         """
@@ -86,26 +144,48 @@ class FontLoader:
         
         logger.info(f"Loading font: {font_path}")
         
+        from fontTools.ttLib import TTFont
+        
         try:
-            # Load with fontTools
-            font = TTFont(font_path)
+            # Reloading replaces (and closes) this loader's previous handles
+            self._close_font(font_path)
+            
+            # Load with fontTools from a read-only memory map. With lazy=True
+            # tables are read from the mapping on demand instead of copying
+            # the whole file into memory first.
+            with open(font_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmaps[font_path] = mapped
+            font = TTFont(mapped, lazy=True)
             self._loaded_fonts[font_path] = font
             
-            # Load with freetype
-            face = freetype.Face(font_path)
+            # Load with freetype (FreeType maps the file itself)
+            face = open_face(font_path)
             self._freetype_faces[font_path] = face
             
-            # Extract font information
-            info = self._extract_font_info(font_path, font, face)
+            # Extract font information, reusing the shared result if this
+            # version of the file was loaded before
+            key = (font_path, os.stat(font_path).st_mtime_ns)
+            with _info_cache_lock:
+                info = _info_cache.get(key)
+                if info is not None:
+                    _info_cache.move_to_end(key)
+            if info is None:
+                info = self._extract_font_info(font_path, font, face)
+                with _info_cache_lock:
+                    _info_cache[key] = info
+                    while len(_info_cache) > _INFO_CACHE_SIZE:
+                        _info_cache.popitem(last=False)
             
             logger.info(f"Successfully loaded font: {info}")
-            return info
+            # Callers get their own copy; the field values are immutable
+            return dataclasses.replace(info)
             
         except Exception as e:
             logger.error(f"Failed to load font {font_path}: {e}")
             raise ValueError(f"Failed to load font: {e}")
     
-    def _extract_font_info(self, font_path: str, font: TTFont, face: freetype.Face) -> FontInfo:
+    def _extract_font_info(self, font_path: str, font: 'TTFont', face: 'freetype.Face') -> FontInfo:
         """
         Extract font information from loaded font
         
@@ -117,13 +197,15 @@ class FontLoader:
         Returns:
             FontInfo object
         """
-        # Get name table
-        name_table = font['name']
+        # Index name records by ID once instead of scanning per lookup
+        names_by_id: Dict[int, List[Any]] = {}
+        for record in font['name'].names:
+            names_by_id.setdefault(record.nameID, []).append(record)
         
         # Extract names (prefer Unicode names)
-        family_name = self._get_name(name_table, 1) or face.family_name.decode('utf-8')
-        style_name = self._get_name(name_table, 2) or face.style_name.decode('utf-8')
-        full_name = self._get_name(name_table, 4) or f"{family_name} {style_name}"
+        family_name = self._get_name(names_by_id, 1) or face.family_name.decode('utf-8')
+        style_name = self._get_name(names_by_id, 2) or face.style_name.decode('utf-8')
+        full_name = self._get_name(names_by_id, 4) or f"{family_name} {style_name}"
         
         # Get head table for metrics
         head = font['head']
@@ -161,33 +243,35 @@ class FontLoader:
             is_fixed_pitch=is_fixed_pitch
         )
     
-    def _get_name(self, name_table, name_id: int) -> Optional[str]:
+    def _get_name(self, names_by_id: Dict[int, List[Any]], name_id: int) -> Optional[str]:
         """
         Get name from name table
         
         Args:
-            name_table: Font name table
+            names_by_id: Name records grouped by name ID, in table order
             name_id: Name ID (1=family, 2=style, 4=full name, etc.)
             
         Returns:
             Name string or None if not found
         """
+        records = names_by_id.get(name_id)
+        if not records:
+            return None
+        
         try:
             # Try to get Unicode name first (platform 3, encoding 1)
-            name_record = name_table.getName(name_id, 3, 1)
-            if name_record:
-                return name_record.toUnicode()
+            for record in records:
+                if record.platformID == 3 and record.platEncID == 1:
+                    return record.toUnicode()
             
             # Fallback to first available name
-            for record in name_table.names:
-                if record.nameID == name_id:
-                    return record.toUnicode()
+            return records[0].toUnicode()
         except Exception as e:
             logger.warning(f"Failed to get name {name_id}: {e}")
         
         return None
     
-    def _get_supported_chars(self, font: TTFont) -> Set[int]:
+    def _get_supported_chars(self, font: 'TTFont') -> FrozenSet[int]:
         """
         Get set of supported Unicode characters
         
@@ -195,9 +279,9 @@ class FontLoader:
             font: Loaded TTFont object
             
         Returns:
-            Set of Unicode code points
+            Frozen set of Unicode code points
         """
-        supported = set()
+        supported: FrozenSet[int] = frozenset()
         
         # Get cmap table
         if 'cmap' not in font:
@@ -208,20 +292,22 @@ class FontLoader:
         
         # Try to find best Unicode cmap
         # Prefer format 12 (full Unicode), then format 4 (BMP only)
-        unicode_cmap = None
+        format12 = None
+        format4 = None
         
         for table in cmap.tables:
-            # Format 12: Unicode full repertoire
-            if table.format == 12 and table.platformID == 3:
-                unicode_cmap = table
+            if table.platformID != 3:
+                continue
+            if table.format == 12:
+                format12 = table
                 break
-            # Format 4: Unicode BMP
-            elif table.format == 4 and table.platformID == 3:
-                if unicode_cmap is None or unicode_cmap.format != 12:
-                    unicode_cmap = table
+            if table.format == 4:
+                format4 = table
+        
+        unicode_cmap = format12 or format4
         
         if unicode_cmap:
-            supported = set(unicode_cmap.cmap.keys())
+            supported = frozenset(unicode_cmap.cmap.keys())
             logger.debug(f"Found {len(supported)} supported characters")
         else:
             logger.warning("No suitable Unicode cmap table found")
@@ -251,7 +337,7 @@ class FontLoader:
             logger.warning(f"Error checking char 0x{char_code:X}: {e}")
             return False
     
-    def get_font(self, font_path: str) -> Optional[TTFont]:
+    def get_font(self, font_path: str) -> Optional['TTFont']:
         """
         Get loaded TTFont object
         
@@ -263,10 +349,12 @@ class FontLoader:
         """
         return self._loaded_fonts.get(font_path)
     
-    def get_freetype_face(self, font_path: str) -> Optional[freetype.Face]:
+    def get_freetype_face(self, font_path: str) -> Optional['freetype.Face']:
         """
         Get loaded FreeType face
-        
+                
+        The face is closed when the font is reloaded or unloaded.
+
         Args:
             font_path: Path to font file
             
@@ -275,19 +363,35 @@ class FontLoader:
         """
         return self._freetype_faces.get(font_path)
     
+    def _close_font(self, font_path: str) -> None:
+        """
+        Close this loader's handles for a font
+        
+        Args:
+            font_path: Path to font file
+        """
+        font = self._loaded_fonts.pop(font_path, None)
+        if font is not None:
+            font.close()
+        
+        face = self._freetype_faces.pop(font_path, None)
+        if face is not None:
+            close_face(face)
+        
+        mapped = self._mmaps.pop(font_path, None)
+        if mapped is not None:
+            mapped.close()
+    
     def unload_font(self, font_path: str) -> None:
         """
         Unload a font from memory
         
+        The font information stays in the process-wide cache (see clear_cache()).
+        
         Args:
             font_path: Path to font file
         """
-        if font_path in self._loaded_fonts:
-            self._loaded_fonts[font_path].close()
-            del self._loaded_fonts[font_path]
-        
-        if font_path in self._freetype_faces:
-            del self._freetype_faces[font_path]
+        self._close_font(font_path)
         
         logger.info(f"Unloaded font: {font_path}")
     
@@ -298,6 +402,12 @@ class FontLoader:
         
         logger.info("Unloaded all fonts")
     
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all font information from the process-wide cache"""
+        with _info_cache_lock:
+            _info_cache.clear()
+    
     def __del__(self):
         """Cleanup when object is destroyed"""
         self.unload_all()
@@ -3,8 +3,12 @@ Glyph renderer module for LVFontConv
 Renders font glyphs to bitmaps with various bit depths
 """
 
+import ctypes
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Tuple, Dict
+from typing import List, Optional, Sequence, Tuple, Dict
 import numpy as np
 import freetype
 
@@ -12,8 +16,57 @@ from utils.logger import get_logger
 
 logger = get_logger()
 
+# Use __slots__ for per-glyph records where supported (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _build_depth_lut(bpp: int) -> np.ndarray:
+    """
+    Build a 256-entry lookup table mapping 8-bit coverage to bpp levels
+    
+    Args:
+        bpp: Target bits per pixel (1, 2, 3, or 4)
+        
+    Returns:
+        uint8 array where lut[value] is the quantized level of value
+    """
+    levels = np.arange(256, dtype=np.uint8)
+    if bpp == 1:
+        # 1-bit: threshold at 50%
+        return (levels >= 128).astype(np.uint8)
+    return levels >> (8 - bpp)
+
+
+# Bit depth conversion tables, applied with a single gather per glyph
+_DEPTH_LUTS: Dict[int, np.ndarray] = {bpp: _build_depth_lut(bpp) for bpp in (1, 2, 3, 4)}
+
+# Read-only all-zero bitmaps shared by blank glyphs of the same size. Every
+# LUT maps 0 to 0, so the bit depth does not need to be part of the key.
+_BLANK_BITMAPS: 'weakref.WeakValueDictionary[Tuple[int, int], np.ndarray]' = \
+    weakref.WeakValueDictionary()
+
+
+def _blank_bitmap(height: int, width: int) -> np.ndarray:
+    """
+    Get the shared read-only zero bitmap of the given size
+    
+    Args:
+        height: Bitmap height
+        width: Bitmap width
+        
+    Returns:
+        (height, width) uint8 array of zeros, not writeable
+    """
+    key = (height, width)
+    blank = _BLANK_BITMAPS.get(key)
+    if blank is None:
+        blank = np.zeros(key, dtype=np.uint8)
+        blank.flags.writeable = False
+        _BLANK_BITMAPS[key] = blank
+    return blank
+
+
+@dataclass(**_SLOTS)
 class GlyphData:
     """
     Glyph rendering data
@@ -54,6 +107,18 @@ class GlyphRenderer:
         self._faces: Dict[str, freetype.Face] = {}
         self._current_size: int = 16
         self._current_bpp: int = 4
+        # Depth LUT for the current bpp, bound once in set_bpp so the
+        # per-glyph path does no dispatch on bpp
+        self._lut: np.ndarray = _DEPTH_LUTS[self._current_bpp]
+        
+        # Kerning results and char -> glyph index lookups; both depend on
+        # the face and (for kerning) the size, so they are reset when
+        # either changes
+        self._kern_cache: Dict[Tuple[str, int, int], Tuple[int, int]] = {}
+        self._char_idx_cache: Dict[Tuple[str, int], int] = {}
+        
+        # Output buffer reused by render_glyph(reuse_buffer=True)
+        self._work_buf = np.empty(256 * 256, dtype=np.uint8)
     
     def set_font_face(self, font_path: str, face: freetype.Face) -> None:
         """
@@ -64,6 +129,8 @@ class GlyphRenderer:
             face: FreeType Face object
         """
         self._faces[font_path] = face
+        self._kern_cache.clear()
+        self._char_idx_cache.clear()
         logger.debug(f"Set font face: {font_path}")
     
     def set_size(self, size: int) -> None:
@@ -76,11 +143,20 @@ class GlyphRenderer:
         if size < 8 or size > 200:
             raise ValueError(f"Invalid font size: {size}. Must be between 8 and 200.")
         
+        changed = size != self._current_size
         self._current_size = size
         
-        # Update all loaded faces
+        # Update loaded faces that are not at this size yet. The face's own
+        # size is checked (not a record of what this renderer last set),
+        # since the caller may share the face and have resized it.
         for face in self._faces.values():
-            face.set_pixel_sizes(0, size)
+            if face.size.y_ppem != size:
+                face.set_pixel_sizes(0, size)
+                changed = True
+        
+        # Kerning is scaled to the pixel size
+        if changed:
+            self._kern_cache.clear()
         
         logger.debug(f"Set font size to {size}px")
     
@@ -95,6 +171,7 @@ class GlyphRenderer:
             raise ValueError(f"Invalid bpp: {bpp}. Must be 1, 2, 3, or 4.")
         
         self._current_bpp = bpp
+        self._lut = _DEPTH_LUTS[bpp]
         logger.debug(f"Set BPP to {bpp}")
     
     def render_glyph(
@@ -102,7 +179,8 @@ class GlyphRenderer:
         font_path: str,
         char_code: int,
         mapped_code: Optional[int] = None,
-        autohint: bool = True
+        autohint: bool = True,
+        reuse_buffer: bool = False
     ) -> Optional[GlyphData]:
         """
         Render a single glyph
@@ -112,6 +190,10 @@ class GlyphRenderer:
             char_code: Source Unicode code point
             mapped_code: Mapped code point (for output), defaults to char_code
             autohint: Enable autohinting
+            reuse_buffer: Write the bitmap into the renderer's work buffer
+                instead of a new array. The bitmap is then only valid until
+                the next render_glyph(reuse_buffer=True) call; copy it to
+                keep it.
             
         Returns:
             GlyphData object or None if glyph doesn't exist
@@ -129,9 +211,7 @@ class GlyphRenderer:
         # - FT_LOAD_RENDER: 直接渲染为位图
         # - FT_LOAD_TARGET_LIGHT: 轻度 hinting (只影响水平线)
         # - FT_LOAD_FORCE_AUTOHINT: 强制使用自动 hinting
-        flags = freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_LIGHT
-        if autohint:
-            flags |= freetype.FT_LOAD_FORCE_AUTOHINT
+        flags = self._load_flags(autohint)
         
         try:
             face.load_char(char_code, flags)
@@ -152,11 +232,22 @@ class GlyphRenderer:
         
         # Extract bitmap data
         if width > 0 and height > 0:
-            # Convert buffer to numpy array
-            bitmap_data = np.array(bitmap.buffer, dtype=np.uint8).reshape(height, width)
+            # View FreeType's native buffer directly; bitmap.buffer would
+            # build a Python list with one int per byte. The view is only
+            # valid until the next load_char, but the bit depth conversion
+            # below always writes to a separate array.
+            bitmap_data = self._native_bitmap(bitmap)
             
-            # Convert to target bit depth
-            bitmap_data = self._convert_bit_depth(bitmap_data, self._current_bpp)
+            # Convert to target bit depth; blank bitmaps skip the LUT and
+            # share one read-only array per size
+            if not bitmap_data.any():
+                bitmap_data = _blank_bitmap(height, width)
+            elif reuse_buffer:
+                out = self._work_view(height, width)
+                np.take(self._lut, bitmap_data, out=out, mode='clip')
+                bitmap_data = out
+            else:
+                bitmap_data = self._lut[bitmap_data]
         else:
             # Empty glyph (e.g., space)
             bitmap_data = np.zeros((0, 0), dtype=np.uint8)
@@ -175,31 +266,87 @@ class GlyphRenderer:
         logger.debug(f"Rendered glyph: {glyph_data}")
         return glyph_data
     
-    def _convert_bit_depth(self, bitmap: np.ndarray, target_bpp: int) -> np.ndarray:
+    @staticmethod
+    def _load_flags(autohint: bool) -> int:
+        """
+        Build FreeType load flags for rendering
+        
+        Args:
+            autohint: Enable autohinting
+            
+        Returns:
+            Combined FT_LOAD_* flags
+        """
+        flags = freetype.FT_LOAD_RENDER | freetype.FT_LOAD_TARGET_LIGHT
+        if autohint:
+            flags |= freetype.FT_LOAD_FORCE_AUTOHINT
+        return flags
+    
+    def _work_view(self, height: int, width: int) -> np.ndarray:
+        """
+        Get a (height, width) view of the work buffer, growing it if needed
+        
+        Args:
+            height: Bitmap height
+            width: Bitmap width
+            
+        Returns:
+            uint8 view into the work buffer
+        """
+        size = height * width
+        if size > self._work_buf.size:
+            self._work_buf = np.empty(size, dtype=np.uint8)
+        return self._work_buf[:size].reshape(height, width)
+    
+    @staticmethod
+    def _native_bitmap(bitmap: freetype.Bitmap) -> np.ndarray:
+        """
+        Wrap a rendered FreeType bitmap as a (rows, width) numpy view
+        
+        Args:
+            bitmap: Bitmap of the current glyph slot (8-bit grayscale)
+            
+        Returns:
+            uint8 array viewing FreeType's buffer (never a copy), with row
+            padding (pitch > width) sliced away
+        """
+        pitch = bitmap.pitch
+        stride = abs(pitch)
+        rows = bitmap.rows
+        
+        native = (ctypes.c_ubyte * (stride * rows)).from_address(
+            ctypes.addressof(bitmap._FT_Bitmap.buffer.contents)
+        )
+        data = np.frombuffer(native, dtype=np.uint8).reshape(rows, stride)
+        if stride != bitmap.width:
+            # Slice away row padding; when pitch == width the view above is
+            # already C-contiguous and is returned as is
+            data = data[:, :bitmap.width]
+        
+        # Negative pitch means rows are stored bottom-up
+        return data if pitch > 0 else data[::-1]
+    
+    def _convert_bit_depth(self, bitmap: np.ndarray, target_bpp: int,
+                           pack: bool = False) -> np.ndarray:
         """
         Convert bitmap to target bit depth
         
         Args:
             bitmap: Input bitmap (8-bit grayscale, 0-255)
             target_bpp: Target bits per pixel (1, 2, 3, or 4)
+            pack: For 1 bpp, pack 8 pixels per byte (MSB first, each row
+                padded to a whole byte) instead of one byte per pixel
             
         Returns:
             Converted bitmap with values in target bit depth range
         """
-        if target_bpp == 1:
-            # 1-bit: threshold at 50%
-            return self._convert_to_1bit(bitmap)
-        elif target_bpp == 2:
-            # 2-bit: 4 levels (0, 85, 170, 255 -> 0, 1, 2, 3)
-            return self._convert_to_2bit(bitmap)
-        elif target_bpp == 3:
-            # 3-bit: 8 levels (0-255 -> 0-7)
-            return self._convert_to_3bit(bitmap)
-        elif target_bpp == 4:
-            # 4-bit: 16 levels (0-255 -> 0-15)
-            return self._convert_to_4bit(bitmap)
-        else:
+        if pack and target_bpp == 1:
+            return np.packbits(bitmap >= 128, axis=1)
+        
+        lut = _DEPTH_LUTS.get(target_bpp)
+        if lut is None:
             return bitmap
+        return lut[bitmap]
     
     def _convert_to_1bit(self, bitmap: np.ndarray, threshold: int = 128) -> np.ndarray:
         """
@@ -212,7 +359,11 @@ class GlyphRenderer:
         Returns:
             1-bit bitmap (values: 0 or 1)
         """
-        return (bitmap >= threshold).astype(np.uint8)
+        if threshold == 128:
+            return _DEPTH_LUTS[1][bitmap]
+        # bool and uint8 share the same one-byte layout, so reinterpret
+        # the comparison result instead of copying it with astype
+        return (bitmap >= threshold).view(np.uint8)
     
     def _convert_to_2bit(self, bitmap: np.ndarray) -> np.ndarray:
         """
@@ -226,7 +377,7 @@ class GlyphRenderer:
         """
         # Map 0-255 to 0-3
         # 0-63 -> 0, 64-127 -> 1, 128-191 -> 2, 192-255 -> 3
-        return (bitmap >> 6).astype(np.uint8)
+        return _DEPTH_LUTS[2][bitmap]
     
     def _convert_to_3bit(self, bitmap: np.ndarray) -> np.ndarray:
         """
@@ -239,7 +390,7 @@ class GlyphRenderer:
             3-bit bitmap (values: 0-7)
         """
         # Map 0-255 to 0-7
-        return (bitmap >> 5).astype(np.uint8)
+        return _DEPTH_LUTS[3][bitmap]
     
     def _convert_to_4bit(self, bitmap: np.ndarray) -> np.ndarray:
         """
@@ -252,7 +403,7 @@ class GlyphRenderer:
             4-bit bitmap (values: 0-15)
         """
         # Map 0-255 to 0-15
-        return (bitmap >> 4).astype(np.uint8)
+        return _DEPTH_LUTS[4][bitmap]
     
     def get_kerning(
         self,
@@ -271,6 +422,11 @@ class GlyphRenderer:
         Returns:
             Tuple of (x_adjust, y_adjust) in pixels
         """
+        key = (font_path, left_char, right_char)
+        cached = self._kern_cache.get(key)
+        if cached is not None:
+            return cached
+        
         if font_path not in self._faces:
             raise ValueError(f"Font face not set: {font_path}")
         
@@ -282,8 +438,8 @@ class GlyphRenderer:
         
         try:
             # Get glyph indices
-            left_glyph = face.get_char_index(left_char)
-            right_glyph = face.get_char_index(right_char)
+            left_glyph = self._char_index(font_path, face, left_char)
+            right_glyph = self._char_index(font_path, face, right_char)
             
             # Get kerning vector
             kerning = face.get_kerning(left_glyph, right_glyph)
@@ -292,11 +448,32 @@ class GlyphRenderer:
             x_adjust = kerning.x >> 6
             y_adjust = kerning.y >> 6
             
-            return (x_adjust, y_adjust)
+            result = (x_adjust, y_adjust)
+            self._kern_cache[key] = result
+            return result
         except Exception as e:
             logger.warning(f"Failed to get kerning for U+{left_char:04X} + U+{right_char:04X}: {e}")
             return (0, 0)
     
+    def _char_index(self, font_path: str, face: freetype.Face, char_code: int) -> int:
+        """
+        Get the glyph index of a character, cached per font
+        
+        Args:
+            font_path: Path to font file (cache key)
+            face: FreeType face of the font
+            char_code: Unicode code point
+            
+        Returns:
+            Glyph index (0 if the character is missing)
+        """
+        key = (font_path, char_code)
+        index = self._char_idx_cache.get(key)
+        if index is None:
+            index = face.get_char_index(char_code)
+            self._char_idx_cache[key] = index
+        return index
+    
     def measure_text(
         self,
         font_path: str,
@@ -317,6 +494,16 @@ class GlyphRenderer:
         if not text:
             return (0, 0)
         
+        if font_path not in self._faces:
+            raise ValueError(f"Font face not set: {font_path}")
+        
+        face = self._faces[font_path]
+        
+        # Same load flags as render_glyph minus FT_LOAD_RENDER: the metrics
+        # come from the same outline or embedded bitmap strike that would be
+        # rendered, but the rasterizer is skipped
+        flags = self._load_flags(True) & ~freetype.FT_LOAD_RENDER
+        
         total_width = 0
         max_height = 0
         prev_char = None
@@ -329,19 +516,66 @@ class GlyphRenderer:
                 kern_x, _ = self.get_kerning(font_path, prev_char, char_code)
                 total_width += kern_x
             
-            # Render glyph to get metrics
-            glyph = self.render_glyph(font_path, char_code)
-            if glyph:
-                total_width += glyph.advance_width
-                max_height = max(max_height, glyph.height)
+            try:
+                face.load_char(char_code, flags)
+            except Exception as e:
+                logger.warning(f"Failed to load glyph U+{char_code:04X}: {e}")
+            else:
+                glyph = face.glyph
+                total_width += glyph.advance.x >> 6
+                # Hinted heights are whole pixels; round up like the bitmap rows
+                max_height = max(max_height, (glyph.metrics.height + 63) >> 6)
             
             prev_char = char_code
         
         return (total_width, max_height)
     
+    def measure_texts(
+        self,
+        items: Sequence[Tuple[str, str]],
+        use_kerning: bool = True
+    ) -> List[Tuple[int, int]]:
+        """
+        Measure several texts, possibly in different fonts
+        
+        Texts are grouped by font and each font is measured in its own
+        thread. A FreeType face must not be used from two threads at once,
+        so texts of the same font stay on one thread.
+        
+        Args:
+            items: Sequence of (font_path, text) pairs
+            use_kerning: Apply kerning adjustments
+            
+        Returns:
+            List of (width, height) in pixels, aligned with items
+        """
+        by_font: Dict[str, List[int]] = {}
+        for index, (font_path, _) in enumerate(items):
+            by_font.setdefault(font_path, []).append(index)
+        
+        results: List[Tuple[int, int]] = [(0, 0)] * len(items)
+        
+        def measure_font(indices: List[int]) -> None:
+            for index in indices:
+                font_path, text = items[index]
+                results[index] = self.measure_text(font_path, text, use_kerning)
+        
+        if len(by_font) <= 1:
+            for indices in by_font.values():
+                measure_font(indices)
+            return results
+        
+        with ThreadPoolExecutor(max_workers=len(by_font)) as pool:
+            # list() re-raises any exception from the workers
+            list(pool.map(measure_font, by_font.values()))
+        
+        return results
+    
     def clear(self) -> None:
         """Clear all loaded font faces"""
         self._faces.clear()
+        self._kern_cache.clear()
+        self._char_idx_cache.clear()
         logger.debug("Cleared all font faces")
 
 
@@ -5,47 +5,65 @@ Handles project file save/load operations with JSON serialization.
 """
 
 import json
+import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 
+from core._range_utils import CharCountCache
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 logger = get_logger()
 
+# __slots__ dataclasses need Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Encode project data as indented UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _load_json(raw: bytes) -> Dict[str, Any]:
+    """Decode project data (orjson.JSONDecodeError subclasses json's)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
 
-@dataclass
-class FontSource:
+@dataclass(**_SLOTS)
+class FontSource(CharCountCache):
     """Font source configuration"""
     path: str
     ranges: List[str]
     symbols: str
     display_name: str = ""
     
-    @property
-    def char_count(self) -> int:
-        """估算字符数"""
-        count = len(self.symbols)
-        for r in self.ranges:
-            if '-' in r:
-                parts = r.split('-')
-                if len(parts) == 2:
-                    try:
-                        start = int(parts[0], 0)
-                        end = int(parts[1], 0)
-                        count += (end - start + 1)
-                    except:
-                        pass
-        return count
+    # Cached char_count, reset whenever ranges/symbols are reassigned
+    _char_count: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    # Cached Path(path).stem, reset whenever path is reassigned
+    _stem: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        # Explicit base call: zero-argument super() breaks in slots dataclasses
+        CharCountCache.__setattr__(self, name, value)
+        if name == 'path':
+            object.__setattr__(self, '_stem', None)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return {
-            "path": self.path,
-            "ranges": self.ranges,
-            "symbols": self.symbols,
-            "display_name": self.display_name or Path(self.path).stem
-        }
+        stem = self._stem
+        if stem is None:
+            stem = Path(self.path).stem
+            object.__setattr__(self, '_stem', stem)
+        return {"path": self.path, "ranges": self.ranges, "symbols": self.symbols,
+                "display_name": self.display_name or stem}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FontSource':
@@ -124,8 +142,7 @@ class Project:
             data = self.to_dict()
             
             # Write to file
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            path.write_bytes(_dump_json(data))
             
             self.file_path = str(path)
             self.modified = False
@@ -156,8 +173,7 @@ class Project:
                 return False
             
             # Read JSON
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json(path.read_bytes())
             
             # Parse project
             loaded_project = Project.from_dict(data)
@@ -4,13 +4,65 @@ Parses various Unicode range formats for character selection
 """
 
 import re
-from typing import List, Tuple, Set
+from typing import Iterator, List, Set, Tuple
 
 from utils.logger import get_logger
 
 logger = get_logger()
 
 
+def _scan_ranges(range_str: str) -> Iterator[Tuple[int, int, int]]:
+    """
+    Tokenize a comma separated range string in one pass
+    
+    Each part is split with str.partition on '=>' and '-' instead of
+    running the regex. Parts the fast path cannot take apart (empty
+    fields, stray '=' or '>') are handed to RangeParser._RANGE_RE, which
+    remains the reference grammar and reports the error.
+    
+    Args:
+        range_str: Range string (e.g., "0x20-0x7F,0x1F450=>0xF005")
+        
+    Yields:
+        (start, end, mapped_start) tuples
+        
+    Raises:
+        ValueError: If a part is malformed or out of range
+    """
+    parse = RangeParser.parse_unicode_point
+    fullmatch = RangeParser._RANGE_RE.fullmatch
+    
+    for part in range_str.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        
+        head, arrow, mapped_str = part.partition('=>')
+        start_str, dash, end_str = head.partition('-')
+        
+        if (not start_str or (dash and not end_str) or (arrow and not mapped_str)
+                or '=' in head or '>' in head or '\n' in mapped_str):
+            match = fullmatch(part)
+            if not match:
+                raise ValueError(f"Invalid range format: '{part}'")
+            start_str, end_str, mapped_str = match.groups()
+        
+        # Parse start
+        start = parse(start_str)
+        
+        # Parse end (default to start if not specified)
+        end = parse(end_str) if end_str else start
+        
+        # Parse mapped start (default to start if not specified)
+        mapped_start = parse(mapped_str) if mapped_str else start
+        
+        # Validate range
+        if start > end:
+            raise ValueError(f"Invalid range: start (0x{start:X}) > end (0x{end:X})")
+        
+        yield start, end, mapped_start
+
+
 class RangeParser:
     """
     Parser for Unicode character ranges
@@ -24,6 +76,10 @@ class RangeParser:
     - Mixed: 0x20-0x7F,0x1F450
     """
     
+    # Pattern for a single range part: start[-end][=>mapped_start]
+    # (used with fullmatch, so no anchors)
+    _RANGE_RE = re.compile(r'([^-=>]+)(?:-([^=>]+))?(?:=>(.+))?')
+    
     @staticmethod
     def parse_unicode_point(s: str) -> int:
         """
@@ -40,16 +96,19 @@ class RangeParser:
         """
         s = s.strip()
         
-        # Try hex format (0x...)
-        hex_match = re.match(r'^0x([0-9a-fA-F]+)$', s)
-        if hex_match:
-            value = int(hex_match.group(1), 16)
-        else:
-            # Try decimal format
-            try:
+        try:
+            if s[:2] in ('0x', '0X'):
+                # Hex format (0x...); int() alone would also accept
+                # signs, underscores and inner whitespace
+                digits = s[2:]
+                if not (digits.isascii() and digits.isalnum()):
+                    raise ValueError(s)
+                value = int(digits, 16)
+            else:
+                # Decimal format
                 value = int(s, 10)
-            except ValueError:
-                raise ValueError(f"'{s}' is not a valid number")
+        except ValueError:
+            raise ValueError(f"'{s}' is not a valid number")
         
         # Check Unicode range
         if value < 0 or value > 0x10FFFF:
@@ -78,40 +137,7 @@ class RangeParser:
             "0x20-0x7F=>0x100" -> [(0x20, 0x7F, 0x100)]
             "0x20-0x7F,0x1F450" -> [(0x20, 0x7F, 0x20), (0x1F450, 0x1F450, 0x1F450)]
         """
-        result = []
-        
-        # Split by comma for multiple ranges
-        parts = [p.strip() for p in range_str.split(',')]
-        
-        for part in parts:
-            if not part:
-                continue
-            
-            # Match pattern: start[-end][=>mapped_start]
-            match = re.match(
-                r'^([^-=>]+)(?:-([^=>]+))?(?:=>(.+))?$',
-                part
-            )
-            
-            if not match:
-                raise ValueError(f"Invalid range format: '{part}'")
-            
-            start_str, end_str, mapped_str = match.groups()
-            
-            # Parse start
-            start = RangeParser.parse_unicode_point(start_str)
-            
-            # Parse end (default to start if not specified)
-            end = RangeParser.parse_unicode_point(end_str) if end_str else start
-            
-            # Parse mapped start (default to start if not specified)
-            mapped_start = RangeParser.parse_unicode_point(mapped_str) if mapped_str else start
-            
-            # Validate range
-            if start > end:
-                raise ValueError(f"Invalid range: start (0x{start:X}) > end (0x{end:X})")
-            
-            result.append((start, end, mapped_start))
+        result = list(_scan_ranges(range_str))
         
         logger.debug(f"Parsed range '{range_str}' -> {result}")
         return result
@@ -153,13 +179,11 @@ class RangeParser:
         Example:
             [(0x20, 0x22, 0x100)] -> [(0x20, 0x100), (0x21, 0x101), (0x22, 0x102)]
         """
-        result = []
+        result: List[Tuple[int, int]] = []
         
         for start, end, mapped_start in ranges:
-            offset = 0
-            for code in range(start, end + 1):
-                result.append((code, mapped_start + offset))
-                offset += 1
+            result.extend(zip(range(start, end + 1),
+                              range(mapped_start, mapped_start + end - start + 1)))
         
         return result
     
@@ -174,7 +198,7 @@ class RangeParser:
         Returns:
             Set of character codes
         """
-        char_set = set()
+        char_set: Set[int] = set()
         
         for start, end, _ in ranges:
             char_set.update(range(start, end + 1))
@@ -186,6 +210,9 @@ class RangeParser:
         """
         Validate ranges for potential issues
         
+        Works on the range bounds only (sorted by start), so the cost
+        depends on the number of ranges, not the number of characters.
+        
         Args:
             ranges: List of (start, end, mapped_start) tuples
             
@@ -194,16 +221,26 @@ class RangeParser:
         """
         warnings = []
         
-        # Check for overlapping source ranges
-        all_chars = []
-        for start, end, _ in ranges:
-            all_chars.extend(range(start, end + 1))
+        # Merge the source ranges in start order: a range starting at or
+        # before the end of the merged ones so far overlaps them
+        overlap = False
+        total_chars = 0
+        merged_end = -1
+        for start, end in sorted((start, end) for start, end, _ in ranges):
+            if start <= merged_end:
+                overlap = True
+                if end > merged_end:
+                    total_chars += end - merged_end
+                    merged_end = end
+            else:
+                total_chars += end - start + 1
+                merged_end = end
         
-        if len(all_chars) != len(set(all_chars)):
+        # Check for overlapping source ranges
+        if overlap:
             warnings.append("Warning: Overlapping source character ranges detected")
         
         # Check for very large ranges
-        total_chars = len(set(all_chars))
         if total_chars > 10000:
             warnings.append(f"Warning: Large character set ({total_chars} characters)")
         
@@ -4,83 +4,45 @@ Simple Font Converter - 简化的字体转换接口
 直接使用 Phase 1 和 Phase 2 的现有 API,构建完整的 LVGLFont 结构。
 """
 
+import functools
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Callable, Set, Dict
-import re
+from typing import List, Optional, Callable, Dict, Tuple
 import numpy as np
 
-from core.font_loader import FontLoader
-from core.glyph_renderer import GlyphRenderer
+# parse_range 一并导入, 保持 core.simple_converter.parse_range 可用
+from core._range_utils import parse_range, collect_codepoints
+from core.font_loader import FontLoader, FontInfo, open_face, close_face
+from core.glyph_renderer import GlyphRenderer, GlyphData as RenderedGlyph
 from writers.lvgl.structures import (
     LVGLFont, LVGLHead, LVGLCmap, LVGLGlyf, LVGLKern,
     CmapSubtable, GlyphData, KernPair,
     CompressionType, SubpixelMode, CmapFormat
 )
 from writers.lvgl.writer import LVGLWriter
+from writers.lvgl.compress import compress_rle_into, rle_buffer_size
+from writers.lvgl._fastpack import pack_bpp
 from utils.logger import get_logger
 
 logger = get_logger()
 
+# 每个转换器最多保留的已加载字体数
+_FONT_CACHE_SIZE = 4
 
-def parse_range(range_str: str) -> List[int]:
-    """
-    解析字符范围字符串
-    
-    支持格式:
-    - "0x30-0x39" (十六进制范围)
-    - "48-57" (十进制范围)
-    - "0x41" (单个十六进制字符)
-    - "65" (单个十进制字符)
-    
-    Args:
-        range_str: 范围字符串
-        
-    Returns:
-        字符码点列表
-    """
-    range_str = range_str.strip()
-    
-    # 匹配范围: 0x30-0x39 或 48-57
-    match = re.match(r'(0x[0-9a-fA-F]+|[0-9]+)\s*-\s*(0x[0-9a-fA-F]+|[0-9]+)', range_str)
-    if match:
-        start_str, end_str = match.groups()
-        start = int(start_str, 16 if start_str.startswith('0x') else 10)
-        end = int(end_str, 16 if end_str.startswith('0x') else 10)
-        return list(range(start, end + 1))
-    
-    # 单个字符: 0x41 或 65
-    match = re.match(r'(0x[0-9a-fA-F]+|[0-9]+)$', range_str)
-    if match:
-        char_str = match.group(1)
-        char_code = int(char_str, 16 if char_str.startswith('0x') else 10)
-        return [char_code]
-    
-    logger.warning(f"无法解析范围字符串: {range_str}")
-    return []
+# 字符数少于该值时串行渲染 (线程和 FreeType Face 的准备开销大于收益)
+_PARALLEL_MIN_CHARS = 1024
 
+# 字符映射表记录: Unicode 码点 -> 字形 ID
+_CMAP_DTYPE = np.dtype([('unicode', np.uint32), ('glyph_id', np.uint32)])
 
-def collect_codepoints(ranges: List[str], symbols: str) -> Set[int]:
-    """
-    收集所有需要转换的字符码点
-    
-    Args:
-        ranges: 范围字符串列表 ["0x30-0x39", "0x41-0x5A"]
-        symbols: 符号字符串 "©®™"
-        
-    Returns:
-        字符码点集合
-    """
-    codepoints = set()
-    
-    # 解析范围
-    for range_str in ranges:
-        codepoints.update(parse_range(range_str))
-    
-    # 添加单独符号
-    for char in symbols:
-        codepoints.add(ord(char))
-    
-    return codepoints
+
+class ConversionCancelled(Exception):
+    """由进度回调抛出以中止当前转换, convert_font 会原样向上抛出"""
 
 
 class SimpleFontConverter:
@@ -90,20 +52,196 @@ class SimpleFontConverter:
     直接使用 Phase 1 和 Phase 2 的现有功能。
     """
     
-    def __init__(self):
-        """初始化转换器"""
+    def __init__(self, jobs: int = 0):
+        """
+        初始化转换器
+        
+        Args:
+            jobs: 渲染线程数 (0 = CPU 核数, 1 = 串行)
+        """
+        if jobs < 0:
+            raise ValueError(f"Invalid jobs: {jobs}. Must be >= 0")
+        
+        self.jobs = jobs
         self.progress_callback: Optional[Callable[[str, int], None]] = None
+        
+        # 上次报告的进度百分比, 用于合并重复的进度更新
+        self._last_pct = -1
+        
+        # 已加载的字体: (路径, 修改时间) -> (FontLoader, FontInfo, GlyphRenderer),
+        # 按最近使用排序。同一字体以不同字号/bpp 多次转换时只加载一次,
+        # 并复用同一个渲染器 (字符索引缓存与字号无关, 可跨字号保留)
+        self._font_cache: 'OrderedDict[Tuple[str, int], Tuple[FontLoader, FontInfo, GlyphRenderer]]' = OrderedDict()
     
     def set_progress_callback(self, callback: Callable[[str, int], None]):
-        """设置进度回调 (message, percentage)"""
+        """设置进度回调 (message, percentage), 回调可抛出 ConversionCancelled 中止转换"""
         self.progress_callback = callback
     
     def _report_progress(self, message: str, percentage: int):
-        """报告进度"""
-        logger.info(f"[{percentage}%] {message}")
+        """
+        报告进度
+        
+        百分比未变化时不再报告: 界面中回调会跨线程投递信号, 渲染阶段的
+        逐块更新大多落在同一百分比上。
+        """
+        if percentage == self._last_pct:
+            return
+        self._last_pct = percentage
+        
+        if logger.is_enabled_for(logging.INFO):
+            logger.info(f"[{percentage}%] {message}")
         if self.progress_callback:
             self.progress_callback(message, percentage)
     
+    def _load_font(self, font_path: str) -> Tuple[FontLoader, FontInfo, GlyphRenderer]:
+        """
+        加载字体, 命中缓存时直接复用
+        
+        Args:
+            font_path: 字体文件路径
+            
+        Returns:
+            (FontLoader, FontInfo, 绑定该字体 Face 的 GlyphRenderer)
+            
+        Raises:
+            ValueError: 字体未正确加载
+        """
+        key = (font_path, os.stat(font_path).st_mtime_ns)
+        cached = self._font_cache.get(key)
+        if cached is not None:
+            self._font_cache.move_to_end(key)
+            return cached
+        
+        font_loader = FontLoader()
+        font_info = font_loader.load_font(font_path)
+        
+        # 从 FontLoader 获取 FreeType Face
+        face = font_loader.get_freetype_face(font_path)
+        if face is None:
+            raise ValueError(f"字体未正确加载: {font_path}")
+        
+        renderer = GlyphRenderer()
+        renderer.set_font_face(font_path, face)  # 传递 FreeType Face
+        
+        self._font_cache[key] = (font_loader, font_info, renderer)
+        
+        # 淘汰最久未使用的字体
+        while len(self._font_cache) > _FONT_CACHE_SIZE:
+            (old_path, _), (old_loader, _, _) = self._font_cache.popitem(last=False)
+            old_loader.unload_font(old_path)
+        
+        return font_loader, font_info, renderer
+    
+    def close(self) -> None:
+        """释放所有已缓存字体的 FreeType Face 和文件句柄"""
+        while self._font_cache:
+            (old_path, _), (old_loader, _, _) = self._font_cache.popitem(last=False)
+            old_loader.unload_font(old_path)
+    
+    def _render_glyphs(
+        self,
+        font_path: str,
+        renderer: GlyphRenderer,
+        codepoints: List[int],
+        size: int,
+        bpp: int
+    ) -> List[Optional[RenderedGlyph]]:
+        """
+        渲染所有字形
+        
+        字符足够多时分发到多个线程, 否则使用传入的渲染器串行渲染。
+        
+        Args:
+            font_path: 字体文件路径
+            renderer: 已配置好的渲染器 (串行时使用)
+            codepoints: 升序排列的码点
+            size: 字体大小 (像素)
+            bpp: 每像素位数
+            
+        Returns:
+            与 codepoints 一一对应的渲染结果, 渲染失败为 None
+        """
+        total_chars = len(codepoints)
+        jobs = self.jobs or os.cpu_count() or 1
+        if jobs > 1 and total_chars >= _PARALLEL_MIN_CHARS:
+            return self._render_parallel(font_path, codepoints, size, bpp, jobs)
+        
+        results: List[Optional[RenderedGlyph]] = []
+        # 约 100 次进度更新, 避免每个字形都格式化消息和调用回调
+        progress_step = max(1, total_chars // 100)
+        
+        # 字体路径固定, 内层循环只做定长的位置参数调用, 进度按块报告,
+        # 不再逐字形传关键字参数和判断是否需要报告进度
+        render = functools.partial(renderer.render_glyph, font_path)
+        for start in range(0, total_chars, progress_step):
+            chunk = codepoints[start:start + progress_step]
+            results.extend([render(code, code) for code in chunk])
+            
+            progress = 30 + int((start / total_chars) * 40)
+            self._report_progress(f"渲染字形 {start + len(chunk)}/{total_chars}", progress)
+        
+        return results
+    
+    def _render_parallel(
+        self,
+        font_path: str,
+        codepoints: List[int],
+        size: int,
+        bpp: int,
+        jobs: int
+    ) -> List[Optional[RenderedGlyph]]:
+        """
+        多线程渲染字形
+        
+        FreeType Face 不是线程安全的, 因此每个线程使用各自的 Face 和渲染器。
+        Face 在调用线程上统一打开 (与其他 Face 的创建/释放串行化), 每个工作
+        线程首次取块时领取一个, 线程池结束后统一释放。FreeType 调用期间会
+        释放 GIL, 字形加载/光栅化可以并行。码点按块分发, 结果按原顺序合并。
+        """
+        total_chars = len(codepoints)
+        # 每个线程约 8 块, 兼顾负载均衡和进度更新频率
+        chunk_size = -(-total_chars // (jobs * 8))
+        chunks = [codepoints[i:i + chunk_size] for i in range(0, total_chars, chunk_size)]
+        jobs = min(jobs, len(chunks))
+        
+        faces = []
+        renderers: 'queue.SimpleQueue[GlyphRenderer]' = queue.SimpleQueue()
+        local = threading.local()
+        
+        def render_chunk(chunk: List[int]) -> List[Optional[RenderedGlyph]]:
+            renderer = getattr(local, 'renderer', None)
+            if renderer is None:
+                # 线程池最多 jobs 个线程, 每个线程只领取一次
+                renderer = local.renderer = renderers.get_nowait()
+            
+            return [
+                renderer.render_glyph(font_path=font_path, char_code=code, mapped_code=code)
+                for code in chunk
+            ]
+        
+        results: List[Optional[RenderedGlyph]] = []
+        try:
+            for _ in range(jobs):
+                face = open_face(font_path)
+                faces.append(face)
+                renderer = GlyphRenderer()
+                renderer.set_font_face(font_path, face)
+                renderer.set_size(size)
+                renderer.set_bpp(bpp)
+                renderers.put(renderer)
+            
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                for chunk_results in pool.map(render_chunk, chunks):
+                    results.extend(chunk_results)
+                    progress = 30 + int((len(results) / total_chars) * 40)
+                    self._report_progress(f"渲染字形 {len(results)}/{total_chars}", progress)
+        finally:
+            for face in faces:
+                close_face(face)
+        
+        logger.debug(f"并行渲染: {total_chars} 个字形, {jobs} 个线程")
+        return results
+    
     def convert_font(
         self,
         font_path: str,
@@ -136,15 +274,16 @@ class SimpleFontConverter:
             
         Returns:
             是否成功
+            
+        Raises:
+            ConversionCancelled: 进度回调请求中止转换
         """
-        font_loader = None
-        
         try:
+            self._last_pct = -1
             self._report_progress(f"加载字体: {Path(font_path).name}", 10)
             
-            # 1. 加载字体
-            font_loader = FontLoader()
-            font_info = font_loader.load_font(font_path)
+            # 1. 加载字体 (同一字体重复转换时复用)
+            font_loader, font_info, renderer = self._load_font(font_path)
             logger.info(f"字体加载成功: {font_info.family_name}")
             
             # 2. 收集字符码点
@@ -160,14 +299,8 @@ class SimpleFontConverter:
             # 3. 创建字形渲染器
             self._report_progress("初始化渲染器", 25)
             
-            # 从 FontLoader 获取 FreeType Face
-            if font_path not in font_loader._freetype_faces:
-                raise ValueError(f"字体未正确加载: {font_path}")
-            
-            face = font_loader._freetype_faces[font_path]
-            
-            renderer = GlyphRenderer()
-            renderer.set_font_face(font_path, face)  # 传递 FreeType Face
+            # 缓存的渲染器已绑定字体。每次转换都重新应用字号: set_size 按 Face
+            # 当前的实际大小判断, Face 被改为其他字号时会重新设置
             renderer.set_size(size)
             
             # BPP 映射: 实际位深度 -> GlyphRenderer 的 bpp 参数
@@ -198,26 +331,15 @@ class SimpleFontConverter:
             )
             glyf.add_glyph(reserved_glyph)
             
-            # 渲染所有字符
-            glyph_id = 1  # 从 1 开始 (0 是保留)
-            bitmap_offset = 0
-            
-            # 用于构建 Cmap
-            char_to_glyph_id = {}
+            # 渲染字形 (使用 Phase 1 的 GlyphRenderer)
+            sorted_cps = sorted(codepoints)
+            rendered_glyphs = self._render_glyphs(font_path, renderer, sorted_cps, size, bpp)
             
-            # 用于计算字体度量 (与原版 lv_font_conv 兼容)
-            bbox_tops = []  # offset_y (bitmap_top)
-            bbox_bottoms = []  # offset_y - height
+            # 按码点位置预分配, 渲染失败的位置保持为 None, 最后一次性收集
+            # 字形 ID 和位图偏移都在收集完成后统一填写
+            converted: List[Optional[GlyphData]] = [None] * len(sorted_cps)
             
-            total_chars = len(codepoints)
-            for i, codepoint in enumerate(sorted(codepoints)):
-                # 渲染字形 (使用 Phase 1 的 GlyphRenderer)
-                rendered_glyph = renderer.render_glyph(
-                    font_path=font_path,
-                    char_code=codepoint,
-                    mapped_code=codepoint
-                )
-                
+            for i, (codepoint, rendered_glyph) in enumerate(zip(sorted_cps, rendered_glyphs)):
                 if not rendered_glyph:
                     logger.warning(f"字符 U+{codepoint:04X} 渲染失败,跳过")
                     continue
@@ -229,90 +351,73 @@ class SimpleFontConverter:
                 # 我们的 offset_y 是 bitmap_top (对应 ft_result.y)
                 ofs_y_value = rendered_glyph.offset_y - rendered_glyph.height
                 
-                lvgl_glyph = GlyphData(
-                    glyph_id=glyph_id,
+                converted[i] = GlyphData(
+                    glyph_id=0,  # 收集完成后统一填写
                     unicode=codepoint,
                     bitmap=rendered_glyph.bitmap,
-                    bitmap_index=bitmap_offset,
+                    bitmap_index=0,  # 渲染完成后统一填写
                     advance_width=float(rendered_glyph.advance_width),
                     box_w=rendered_glyph.width,
                     box_h=rendered_glyph.height,
                     ofs_x=rendered_glyph.offset_x,
                     ofs_y=ofs_y_value
                 )
-                
-                glyf.add_glyph(lvgl_glyph)
-                char_to_glyph_id[codepoint] = glyph_id
-                
-                # 收集 bbox 用于度量计算 (与原版 lv_font_conv 相同的算法)
-                # 原版: bbox.y = ft_result.y - ft_result.height
-                #       ascent = max(bbox.y + bbox.height) = max(ft_result.y)
-                #       descent = min(bbox.y) = min(ft_result.y - height)
-                if rendered_glyph.height > 0:
-                    bbox_tops.append(rendered_glyph.offset_y)
-                    bbox_bottoms.append(rendered_glyph.offset_y - rendered_glyph.height)
-                
-                # 更新位图偏移
-                bitmap_size = rendered_glyph.width * rendered_glyph.height
-                if bpp == 1:
-                    bitmap_offset += (bitmap_size + 7) // 8
-                elif bpp == 2:
-                    bitmap_offset += (bitmap_size + 3) // 4
-                elif bpp == 4:
-                    bitmap_offset += (bitmap_size + 1) // 2
-                else:  # bpp == 8
-                    bitmap_offset += bitmap_size
-                
-                glyph_id += 1
-                
-                # 更新进度
-                if i % 10 == 0 or i == total_chars - 1:
-                    progress = 30 + int((i / total_chars) * 40)
-                    self._report_progress(
-                        f"渲染字形 {i+1}/{total_chars}",
-                        progress
-                    )
-            
-            if len(glyf.glyphs) <= 1:  # 只有保留字形
+            
+            lvgl_glyphs = [g for g in converted if g is not None]
+            if not lvgl_glyphs:
                 logger.error("没有成功渲染任何字形")
                 return False
             
-            logger.info(f"成功渲染 {len(glyf.glyphs) - 1} 个字形")
+            glyf.glyphs.extend(lvgl_glyphs)
+            logger.info(f"成功渲染 {len(lvgl_glyphs)} 个字形")
+            
+            # 收集 bbox 用于度量计算 (与原版 lv_font_conv 相同的算法)
+            # 原版: bbox.y = ft_result.y - ft_result.height
+            #       ascent = max(bbox.y + bbox.height) = max(ft_result.y)
+            #       descent = min(bbox.y) = min(ft_result.y - height)
+            # 一次性取出所有字形的 (box_w, box_h, ofs_y), 度量和位图偏移都在数组上计算
+            geometry = np.array([(g.box_w, g.box_h, g.ofs_y) for g in lvgl_glyphs],
+                                dtype=np.int64).reshape(-1, 3)
+            box_w, box_h, ofs_y = geometry.T
+            visible = box_h > 0
+            bbox_tops = (ofs_y + box_h)[visible]  # offset_y (bitmap_top)
+            bbox_bottoms = ofs_y[visible]  # offset_y - height
+            
+            # 一次性计算位图偏移: 每个字形打包后的字节数做前缀和
+            sizes = box_w * box_h
+            # 每字节像素数均为 2 的幂, 向上取整的除法用移位完成
+            shift = {1: 3, 2: 2, 4: 1}.get(bpp, 0)
+            packed_sizes = (sizes + ((1 << shift) - 1)) >> shift
+            offsets = np.concatenate(([0], np.cumsum(packed_sizes)[:-1]))
+            # 字形 ID 从 1 开始 (0 是保留), 按收集顺序连续分配
+            for glyph_id, (lvgl_glyph, offset) in enumerate(
+                    zip(lvgl_glyphs, offsets.tolist()), start=1):
+                lvgl_glyph.glyph_id = glyph_id
+                lvgl_glyph.bitmap_index = offset
             
             # 5. 构建 Cmap
             self._report_progress("构建字符映射表", 75)
             cmap = LVGLCmap()
             
-            # 简化: 为每个字符范围创建一个子表
-            sorted_chars = sorted(char_to_glyph_id.keys())
-            if sorted_chars:
-                # 创建连续范围
-                range_start = sorted_chars[0]
-                range_chars = [range_start]
-                
-                for char in sorted_chars[1:]:
-                    if char == range_chars[-1] + 1:
-                        # 连续字符
-                        range_chars.append(char)
-                    else:
-                        # 创建子表
-                        subtable = CmapSubtable(
-                            range_start=range_start,
-                            range_length=len(range_chars),
-                            glyph_id_start=char_to_glyph_id[range_start],
-                            format=CmapFormat.FORMAT0_TINY
-                        )
-                        cmap.add_subtable(subtable)
-                        
-                        # 开始新范围
-                        range_start = char
-                        range_chars = [char]
-                
-                # 添加最后一个范围
+            # 字形 ID 按渲染成功的顺序从 1 连续分配, 一次性生成映射记录
+            cmap_records = np.empty(len(lvgl_glyphs), dtype=_CMAP_DTYPE)
+            cmap_records['unicode'] = [g.unicode for g in lvgl_glyphs]
+            cmap_records['glyph_id'] = np.arange(1, len(lvgl_glyphs) + 1)
+            
+            # 简化: 为每个连续字符范围创建一个子表
+            # 相邻码点差值不为 1 处即为新范围的起点
+            unicodes = cmap_records['unicode'].astype(np.int64)
+            run_starts = np.concatenate(
+                ([0], np.flatnonzero(np.diff(unicodes) != 1) + 1)
+            )
+            run_lengths = np.diff(np.append(run_starts, len(unicodes)))
+            run_records = cmap_records[run_starts]
+            
+            for record, run_length in zip(run_records.tolist(), run_lengths.tolist()):
                 subtable = CmapSubtable(
-                    range_start=range_start,
-                    range_length=len(range_chars),
-                    glyph_id_start=char_to_glyph_id[range_start],
+                    range_start=record[0],
+                    range_length=run_length,
+                    glyph_id_start=record[1],
                     format=CmapFormat.FORMAT0_TINY
                 )
                 cmap.add_subtable(subtable)
@@ -330,9 +435,9 @@ class SimpleFontConverter:
             #   descent: Math.min(...glyphs.map(g => g.bbox.y)),
             # 其中 bbox.y = ft_result.y - ft_result.height
             # 所以 ascent = max(ft_result.y), descent = min(ft_result.y - height)
-            if bbox_tops:
-                ascent = max(bbox_tops)
-                descent = min(bbox_bottoms)
+            if bbox_tops.size:
+                ascent = int(bbox_tops.max())
+                descent = int(bbox_bottoms.min())
             else:
                 # 如果没有字形,使用默认值
                 ascent = size
@@ -392,8 +497,26 @@ class SimpleFontConverter:
             
             return True
             
+        except ConversionCancelled:
+            logger.info(f"字体转换已取消: {font_path}")
+            raise
         except Exception as e:
             logger.error(f"字体转换失败: {e}")
             import traceback
             traceback.print_exc()
             return False
+
+
+def warm_up_kernels():
+    """
+    预热输出写入器使用的位图内核
+    
+    安装 numba 时, 打包和 RLE 压缩内核在首次调用时才编译 (或从磁盘缓存加载),
+    首次转换会因此多等约 1 秒。用 1 个像素的数据各调用一次, 参数类型与
+    LVGLWriter 实际调用一致。未安装 numba 时只是几次廉价的 NumPy 调用。
+    可在后台线程中调用。
+    """
+    pixel = np.zeros(1, dtype=np.uint8)
+    for bpp in (1, 2, 4, 8):
+        pack_bpp(pixel, bpp)
+    compress_rle_into(pixel, 4, np.empty(rle_buffer_size(1, 4), dtype=np.uint8))
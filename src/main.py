@@ -5,18 +5,29 @@ A PyQt6-based font converter for LVGL with preview capabilities
 """
 
 import sys
+import threading
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import QApplication, QSplashScreen
 
 # 添加当前目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ui.main_window import MainWindow
 from utils.logger import get_logger
 
 logger = get_logger()
 
 
+def _preload_converter():
+    """后台预先导入转换器模块并预热其位图内核"""
+    try:
+        from core.simple_converter import warm_up_kernels
+        warm_up_kernels()
+    except Exception as e:  # 预加载失败不影响启动, 首次转换时会再次导入并报告错误
+        logger.warning(f"预加载转换器失败: {e}")
+
+
 def main():
     """Main application entry point"""
     app = QApplication(sys.argv)
@@ -32,9 +43,23 @@ def main():
     logger.info("LVFontConv 启动 v0.1.0")
     logger.info("=" * 70)
     
+    # 主窗口会连带导入 FreeType/NumPy, 先显示启动画面再导入
+    pixmap = QPixmap(360, 120)
+    pixmap.fill(app.palette().window().color())
+    splash = QSplashScreen(pixmap)
+    splash.showMessage("LVFontConv 正在启动...", Qt.AlignmentFlag.AlignCenter)
+    splash.show()
+    app.processEvents()
+    
+    from ui.main_window import MainWindow
+    
     # 创建并显示主窗口
     window = MainWindow()
     window.show()
+    splash.finish(window)
+    
+    # 转换器在首次转换时才导入, 窗口显示后在后台预先导入, 避免点击转换时卡顿
+    threading.Thread(target=_preload_converter, daemon=True).start()
     
     # 运行事件循环
     return app.exec()
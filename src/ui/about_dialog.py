@@ -4,6 +4,9 @@
 显示版本号、作者、许可证等信息。
 """
 
+from typing import ClassVar, Optional
+
+from PyQt6 import sip
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
@@ -17,6 +20,9 @@ class AboutDialog(QDialog):
     LICENSE = "MIT License"
     DESCRIPTION = "LVGL 字体转换工具 - 将 TTF/OTF 字体转换为 LVGL C 代码"
     
+    # 内容全部是静态的, 首次打开后缓存实例, 之后直接复用
+    _instance: ClassVar[Optional['AboutDialog']] = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("关于 LVFontConv")
@@ -87,6 +93,10 @@ class AboutDialog(QDialog):
     
     @staticmethod
     def show_about(parent=None):
-        """显示关于对话框"""
-        dialog = AboutDialog(parent)
+        """显示关于对话框 (复用缓存的实例)"""
+        dialog = AboutDialog._instance
+        # 父窗口变化或底层 C++ 对象已被销毁 (如随父窗口释放) 时重新创建
+        if dialog is None or sip.isdeleted(dialog) or dialog.parent() is not parent:
+            dialog = AboutDialog(parent)
+            AboutDialog._instance = dialog
         dialog.exec()
@@ -4,19 +4,34 @@
 提供字体大小、BPP、压缩方式、LVGL版本等配置选项的图形界面。
 """
 
-from dataclasses import dataclass, field
+import os
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field, fields
 from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox,
     QLabel, QSlider, QSpinBox, QComboBox, QRadioButton, 
     QButtonGroup, QCheckBox, QLineEdit, QPushButton, QFileDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QSignalBlocker, pyqtSignal
 
 from utils.logger import get_logger
 
 logger = get_logger()
 
+# 输出格式 / 压缩方式, 顺序与下拉框选项一致
+_FORMATS = ("lvgl", "bin", "dump")
+_FORMAT_INDEX = {name: i for i, name in enumerate(_FORMATS)}
+_COMPRESSIONS = ("rle", "none")
+_COMPRESSION_INDEX = {name: i for i, name in enumerate(_COMPRESSIONS)}
+
+# 各输出格式的保存文件过滤器 (按下拉框索引)
+_FORMAT_FILTERS = {
+    0: "C 文件 (*.c);;所有文件 (*)",  # lvgl
+    1: "二进制文件 (*.bin);;所有文件 (*)",  # bin
+    2: "文本文件 (*.txt);;所有文件 (*)",  # dump
+}
+
 
 @dataclass
 class ConvertConfig:
@@ -51,38 +66,17 @@ class ConvertConfig:
     
     def to_dict(self) -> dict:
         """转换为字典"""
-        return {
-            'font_size': self.font_size,
-            'bpp': self.bpp,
-            'compression': self.compression,
-            'lvgl_version': self.lvgl_version,
-            'output_format': self.output_format,
-            'output_dir': self.output_dir,
-            'output_name': self.output_name,
-            'no_compress': self.no_compress,
-            'no_prefilter': self.no_prefilter,
-            'no_kerning': self.no_kerning,
-            'lcd': self.lcd,
-            'lcd_v': self.lcd_v,
-        }
+        # 字段均为标量, 浅拷贝实例字典即可 (asdict 会逐字段递归深拷贝, 慢得多)
+        return dict(vars(self))
     
     @classmethod
     def from_dict(cls, data: dict) -> 'ConvertConfig':
-        """从字典创建"""
-        return cls(
-            font_size=data.get('font_size', 16),
-            bpp=data.get('bpp', 4),
-            compression=data.get('compression', 'rle'),
-            lvgl_version=data.get('lvgl_version', 8),
-            output_format=data.get('output_format', 'lvgl'),
-            output_dir=data.get('output_dir', './output'),
-            output_name=data.get('output_name', 'my_font'),
-            no_compress=data.get('no_compress', False),
-            no_prefilter=data.get('no_prefilter', False),
-            no_kerning=data.get('no_kerning', False),
-            lcd=data.get('lcd', False),
-            lcd_v=data.get('lcd_v', False),
-        )
+        """从字典创建 (缺少的字段使用默认值, 未知的键忽略)"""
+        return cls(**{key: value for key, value in data.items() if key in _CONFIG_FIELDS})
+
+
+# ConvertConfig 的字段名, from_dict 据此过滤输入
+_CONFIG_FIELDS = frozenset(f.name for f in fields(ConvertConfig))
 
 
 class ConfigWidget(QWidget):
@@ -94,6 +88,11 @@ class ConfigWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.config = ConvertConfig()
+        
+        # 批量更新嵌套深度, 以及批量期间是否有配置变化 (见 batch())
+        self._batch_depth = 0
+        self._batch_dirty = False
+        
         self._init_ui()
         logger.info("配置组件初始化完成")
     
@@ -264,11 +263,46 @@ class ConfigWidget(QWidget):
         
         return group
     
+    # 信号合并
+    def _emit_changed(self):
+        """发出 config_changed; 批量更新期间只做标记, 结束时统一发出"""
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.config_changed.emit()
+    
+    @contextmanager
+    def batch(self):
+        """
+        批量更新配置 (可嵌套)
+        
+        期间的配置变化合并, 退出最外层时最多发出一次 config_changed。
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self.config_changed.emit()
+    
+    def _input_widgets(self) -> tuple:
+        """所有会触发配置变化的输入控件"""
+        return (
+            self.size_slider, self.size_spinbox, self.bpp_group,
+            self.lvgl_version_combo, self.output_format_combo, self.compression_combo,
+            self.output_dir_edit, self.output_name_edit,
+            self.no_compress_check, self.no_prefilter_check, self.no_kerning_check,
+            self.lcd_check, self.lcd_v_check,
+            *self.bpp_group.buttons(),
+        )
+    
     # 事件处理
     def _on_size_changed(self, value: int):
         """字体大小改变"""
         self.config.font_size = value
-        self.config_changed.emit()
+        self._emit_changed()
         logger.debug(f"字体大小: {value}")
     
     def _on_bpp_changed(self):
@@ -277,38 +311,36 @@ class ConfigWidget(QWidget):
         if button:
             bpp = self.bpp_group.id(button)
             self.config.bpp = bpp
-            self.config_changed.emit()
+            self._emit_changed()
             logger.debug(f"BPP: {bpp}")
     
     def _on_lvgl_version_changed(self, text: str):
         """LVGL 版本改变"""
         self.config.lvgl_version = int(text)
-        self.config_changed.emit()
+        self._emit_changed()
         logger.debug(f"LVGL 版本: {text}")
     
     def _on_output_format_changed(self, index: int):
         """输出格式改变"""
-        formats = ["lvgl", "bin", "dump"]
-        self.config.output_format = formats[index]
-        self.config_changed.emit()
-        logger.debug(f"输出格式: {formats[index]}")
+        self.config.output_format = _FORMATS[index]
+        self._emit_changed()
+        logger.debug(f"输出格式: {_FORMATS[index]}")
     
     def _on_compression_changed(self, index: int):
         """压缩方式改变"""
-        compressions = ["rle", "none"]
-        self.config.compression = compressions[index]
-        self.config_changed.emit()
-        logger.debug(f"压缩方式: {compressions[index]}")
+        self.config.compression = _COMPRESSIONS[index]
+        self._emit_changed()
+        logger.debug(f"压缩方式: {_COMPRESSIONS[index]}")
     
     def _on_output_name_changed(self, text: str):
         """输出文件名改变"""
         self.config.output_name = text
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_output_dir_changed(self, text: str):
         """输出目录改变"""
         self.config.output_dir = text
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_browse_output_dir(self):
         """浏览输出目录"""
@@ -324,17 +356,10 @@ class ConfigWidget(QWidget):
     def _on_browse_output_file(self):
         """浏览输出文件"""
         # 根据输出格式确定文件过滤器
-        format_filters = {
-            0: "C 文件 (*.c);;所有文件 (*)",  # lvgl
-            1: "二进制文件 (*.bin);;所有文件 (*)",  # bin
-            2: "文本文件 (*.txt);;所有文件 (*)",  # dump
-        }
-        
         current_format = self.output_format_combo.currentIndex()
-        file_filter = format_filters.get(current_format, "所有文件 (*)")
+        file_filter = _FORMAT_FILTERS.get(current_format, "所有文件 (*)")
         
         # 构建默认文件名（包含目录）
-        import os
         default_path = os.path.join(
             self.config.output_dir,
             self.config.output_name
@@ -349,7 +374,6 @@ class ConfigWidget(QWidget):
         
         if file_path:
             # 分离目录和文件名
-            import os
             dir_path = os.path.dirname(file_path)
             file_name = os.path.basename(file_path)
             
@@ -363,17 +387,17 @@ class ConfigWidget(QWidget):
     def _on_no_compress_changed(self, state: int):
         """禁用压缩改变"""
         self.config.no_compress = bool(state)
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_no_prefilter_changed(self, state: int):
         """禁用预过滤改变"""
         self.config.no_prefilter = bool(state)
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_no_kerning_changed(self, state: int):
         """禁用字距调整改变"""
         self.config.no_kerning = bool(state)
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_lcd_changed(self, state: int):
         """LCD 模式改变"""
@@ -381,7 +405,7 @@ class ConfigWidget(QWidget):
         if self.config.lcd and self.config.lcd_v:
             # 互斥: 如果启用 LCD,禁用 LCD-V
             self.lcd_v_check.setChecked(False)
-        self.config_changed.emit()
+        self._emit_changed()
     
     def _on_lcd_v_changed(self, state: int):
         """LCD 垂直模式改变"""
@@ -389,7 +413,7 @@ class ConfigWidget(QWidget):
         if self.config.lcd_v and self.config.lcd:
             # 互斥: 如果启用 LCD-V,禁用 LCD
             self.lcd_check.setChecked(False)
-        self.config_changed.emit()
+        self._emit_changed()
     
     # 公共 API
     def get_config(self) -> ConvertConfig:
@@ -400,37 +424,46 @@ class ConfigWidget(QWidget):
         """设置配置"""
         self.config = config
         
-        # 更新 UI
-        self.size_slider.setValue(config.font_size)
-        self.size_spinbox.setValue(config.font_size)
-        
-        # 设置 BPP
-        for button in self.bpp_group.buttons():
-            if self.bpp_group.id(button) == config.bpp:
-                button.setChecked(True)
-                break
-        
-        self.lvgl_version_combo.setCurrentText(str(config.lvgl_version))
-        
-        # 输出格式
-        formats = ["lvgl", "bin", "dump"]
-        if config.output_format in formats:
-            self.output_format_combo.setCurrentIndex(formats.index(config.output_format))
-        
-        # 压缩方式
-        compressions = ["rle", "none"]
-        if config.compression in compressions:
-            self.compression_combo.setCurrentIndex(compressions.index(config.compression))
-        
-        self.output_dir_edit.setText(config.output_dir)
-        self.output_name_edit.setText(config.output_name)
-        
-        # 高级选项
-        self.no_compress_check.setChecked(config.no_compress)
-        self.no_prefilter_check.setChecked(config.no_prefilter)
-        self.no_kerning_check.setChecked(config.no_kerning)
-        self.lcd_check.setChecked(config.lcd)
-        self.lcd_v_check.setChecked(config.lcd_v)
+        # 控件的逐个 valueChanged/textChanged 不再触发槽函数 (配置已整体替换),
+        # 更新完成后只发出一次 config_changed。QSignalBlocker 退出时恢复控件
+        # 原有的阻塞状态, 而不是无条件解除
+        with self.batch(), ExitStack() as blockers:
+            for widget in self._input_widgets():
+                blockers.enter_context(QSignalBlocker(widget))
+            
+            # 更新 UI
+            self.size_slider.setValue(config.font_size)
+            self.size_spinbox.setValue(config.font_size)
+            
+            # 设置 BPP
+            for button in self.bpp_group.buttons():
+                if self.bpp_group.id(button) == config.bpp:
+                    button.setChecked(True)
+                    break
+            
+            self.lvgl_version_combo.setCurrentText(str(config.lvgl_version))
+            
+            # 输出格式
+            format_index = _FORMAT_INDEX.get(config.output_format)
+            if format_index is not None:
+                self.output_format_combo.setCurrentIndex(format_index)
+            
+            # 压缩方式
+            compression_index = _COMPRESSION_INDEX.get(config.compression)
+            if compression_index is not None:
+                self.compression_combo.setCurrentIndex(compression_index)
+            
+            self.output_dir_edit.setText(config.output_dir)
+            self.output_name_edit.setText(config.output_name)
+            
+            # 高级选项
+            self.no_compress_check.setChecked(config.no_compress)
+            self.no_prefilter_check.setChecked(config.no_prefilter)
+            self.no_kerning_check.setChecked(config.no_kerning)
+            self.lcd_check.setChecked(config.lcd)
+            self.lcd_v_check.setChecked(config.lcd_v)
+            
+            self._emit_changed()
         
         logger.info("配置已加载")
     
@@ -4,149 +4,390 @@
 提供进度条、日志输出、取消按钮和成功/失败状态显示。
 """
 
+import functools
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QProgressBar, QTextEdit, QPushButton, QMessageBox
+    QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QProgressBar, QPlainTextEdit, QPushButton, QMessageBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QTextCursor, QFont
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QMutex, QMutexLocker
+from PyQt6.QtGui import QFont
+from PyQt6 import sip
 
-from core.simple_converter import SimpleFontConverter
 from utils.logger import get_logger
 
 logger = get_logger()
 
+# 日志攒够该行数后立即发送
+_LOG_BATCH_LINES = 32
+
+# 距上次发送超过该秒数时立即发送, 保证日志及时显示
+_LOG_FLUSH_INTERVAL = 0.05
+
+# 并行转换时检查取消请求的间隔 (秒)
+_CANCEL_POLL_INTERVAL = 0.1
+
+# 界面读取转换进度的间隔 (毫秒, 约 30 Hz)
+_PROGRESS_POLL_MS = 33
+
+# 日志窗口最多保留的行数
+_LOG_MAX_LINES = 5000
+
+# 状态标签样式 (预先拼好, 不在每次状态变化时重新拼接)
+_STATUS_STYLE = "font-weight: bold; font-size: 14px;"
+_STATUS_STYLE_OK = _STATUS_STYLE + " color: green;"
+_STATUS_STYLE_FAIL = _STATUS_STYLE + " color: red;"
+
+# 确认对话框的按钮
+_YES_NO = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+
+
+@functools.lru_cache(maxsize=None)
+def _log_font() -> QFont:
+    """日志等宽字体 (QFont 需在 QApplication 创建后构造, 首次使用时创建)"""
+    return QFont("Monospace", 9)
+
 
 class ConvertThread(QThread):
     """转换工作线程"""
     
-    # 信号
-    progress_updated = pyqtSignal(int, str)  # (进度, 消息)
-    log_message = pyqtSignal(str)  # 日志消息
+    # 信号 (进度不走信号, 由对话框定时读取 take_progress)
+    log_batch = pyqtSignal(list)  # 日志消息 (按批发送的多行)
     conversion_finished = pyqtSignal(bool, str)  # (成功, 消息)
     
     def __init__(self, fonts, config):
         super().__init__()
         self.fonts = fonts  # 字体源列表
         self.config = config  # 转换配置
-        self.is_cancelled = False
+        
+        # 取消请求: 界面线程设置, 转换线程和线程池中的转换任务读取
+        self._cancel_event = threading.Event()
+        
+        # 待发送的日志行, 只在工作线程中读写
+        self._log_buf: List[str] = []
+        self._last_flush = 0.0
+        
+        # 最新进度 (进度, 消息), 界面读取后清空; 转换线程和线程池中的
+        # 转换任务都会写入, 用互斥锁保护
+        self._state_lock = QMutex()
+        self._state: Optional[Tuple[int, str]] = None
+        # 各字体的转换进度百分比
+        self._font_pcts: List[int] = []
+    
+    def _log(self, message: str):
+        """
+        记录一行日志
+        
+        每行单独发信号会逐行跨线程投递并触发界面重绘, 因此先缓存,
+        攒够 _LOG_BATCH_LINES 行或距上次发送超过 _LOG_FLUSH_INTERVAL 秒再整批发送。
+        """
+        self._log_buf.append(message)
+        self._maybe_flush_log()
+    
+    def _log_lines(self, lines: List[str]):
+        """一次记录多行日志 (整块入缓存, 只检查一次是否需要发送)"""
+        self._log_buf.extend(lines)
+        self._maybe_flush_log()
+    
+    def _maybe_flush_log(self):
+        """缓存行数或间隔达到阈值时发送"""
+        if (len(self._log_buf) >= _LOG_BATCH_LINES
+                or time.monotonic() - self._last_flush >= _LOG_FLUSH_INTERVAL):
+            self._flush_log()
+    
+    def _flush_log(self):
+        """发送缓存的日志行"""
+        if self._log_buf:
+            self.log_batch.emit(self._log_buf)
+            self._log_buf = []
+        self._last_flush = time.monotonic()
+    
+    def _set_progress(self, value: int, message: str):
+        """记录最新进度 (只覆盖状态, 不发信号)"""
+        with QMutexLocker(self._state_lock):
+            self._state = (value, message)
+    
+    def _set_font_progress(self, index: int, percentage: int, message: str):
+        """记录单个字体的进度, 总进度为各字体进度的平均值"""
+        total_fonts = len(self.fonts)
+        with QMutexLocker(self._state_lock):
+            self._font_pcts[index] = percentage
+            self._state = (
+                sum(self._font_pcts) // total_fonts,
+                f"处理字体 {index+1}/{total_fonts}: {message}",
+            )
+    
+    def take_progress(self) -> Optional[Tuple[int, str]]:
+        """
+        取出最新进度 (由界面线程定时调用)
+        
+        转换器每一步都会更新进度, 逐次发信号会挤满界面事件队列;
+        只保留最新状态, 界面按固定频率读取, 更新频率与转换速度无关。
+        
+        Returns:
+            (进度, 消息), 自上次读取后没有变化时返回 None
+        """
+        with QMutexLocker(self._state_lock):
+            state, self._state = self._state, None
+        return state
+    
+    def _emit_finished(self, success: bool, message: str):
+        """发送完成信号 (先发送剩余日志)"""
+        self._flush_log()
+        self.conversion_finished.emit(success, message)
+    
+    def _convert_font(self, converter, index: int, font, log: Callable[[List[str]], None]) -> Optional[str]:
+        """
+        转换单个字体
+        
+        Args:
+            converter: 使用的 SimpleFontConverter
+            index: 字体序号
+            font: 字体源
+            log: 日志输出函数 (接收多行)
+            
+        Returns:
+            失败时返回错误信息, 成功返回 None
+        """
+        config = self.config
+        total_fonts = len(self.fonts)
+        
+        # 显示字体信息 (属性各读取一次, 日志和转换参数共用)
+        name = font.display_name
+        path = font.path
+        ranges = font.ranges
+        symbols = font.symbols
+        log([
+            f"[{index+1}/{total_fonts}] 处理字体: {name}",
+            f"  路径: {path}",
+            f"  范围: {', '.join(ranges) if ranges else '无'}",
+            f"  符号: {symbols or '无'}",
+            f"  字符数: {font.char_count}",
+            "",
+        ])
+        
+        # 构建输出路径
+        output_filename = f"{config.output_name}_{index}" if total_fonts > 1 else config.output_name
+        output_path = os.path.join(config.output_dir, output_filename)
+        
+        from core.simple_converter import ConversionCancelled
+        
+        cancelled = self._cancel_event.is_set
+        
+        def progress_callback(message: str, percentage: int):
+            # 在转换的各个步骤之间检查取消请求, 不必等到整个字体转换完成
+            if cancelled():
+                raise ConversionCancelled()
+            log([f"  {message}"])
+            self._set_font_progress(index, percentage, message)
+        
+        converter.set_progress_callback(progress_callback)
+        
+        try:
+            success = converter.convert_font(
+                font_path=path,
+                ranges=ranges,
+                symbols=symbols,
+                size=config.font_size,
+                bpp=config.bpp,
+                output_path=output_path,
+                compression=config.compression,
+                lvgl_version=config.lvgl_version,
+                no_kerning=config.no_kerning,
+                lcd_mode=config.lcd,
+                lcd_v_mode=config.lcd_v
+            )
+            
+            if success:
+                log([f"  ✓ 转换完成: {output_path}.c", ""])
+                return None
+            log([f"  ✗ 转换失败"])
+            return f"字体 {name} 转换失败"
+            
+        except ConversionCancelled:
+            log(["\n转换已取消"])
+            return "用户取消操作"
+        except FileNotFoundError as e:
+            error_msg = f"文件不存在: {str(e)}\n建议: 检查字体文件路径是否正确"
+        except PermissionError as e:
+            error_msg = f"权限错误: {str(e)}\n建议: 检查输出目录的写入权限"
+        except ValueError as e:
+            error_msg = f"参数错误: {str(e)}\n建议: 检查字体大小、BPP 等配置参数是否有效"
+        except Exception as e:
+            error_msg = f"转换失败: {str(e)}\n建议: 检查字体文件是否有效,或尝试更改配置参数"
+        
+        log([f"\n  ✗ 错误: {error_msg}"])
+        return error_msg
+    
+    def _convert_group(self, indexes: List[int], results: List[Future], jobs: int):
+        """
+        在线程池中依次转换使用同一字体文件的若干字体
+        
+        同一文件的字体放在同一任务中串行转换, 共用一个转换器 (及其已加载的
+        字体), 不会有两个线程同时使用同一字体。每个字体的日志先缓存在本地,
+        结果 (日志行, 错误信息) 写入 results 中对应的 Future, 由 run 按字体
+        顺序整块输出, 多个字体的日志不会交错。
+        
+        各线程的 FreeType Face 经 core.font_loader.open_face/close_face 创建
+        和释放, 与其他线程串行化; 转换器在任务结束时关闭, 不依赖垃圾回收。
+        """
+        from core.simple_converter import SimpleFontConverter
+        
+        converter = SimpleFontConverter(jobs=jobs)
+        try:
+            for i in indexes:
+                if self._cancel_event.is_set():
+                    return
+                lines: List[str] = []
+                error = self._convert_font(converter, i, self.fonts[i], lines.extend)
+                results[i].set_result((lines, error))
+                if error is not None:
+                    return
+        except BaseException as e:
+            # 让 run 中等待这些字体的调用收到异常
+            for i in indexes:
+                if not results[i].done():
+                    results[i].set_exception(e)
+            raise
+        finally:
+            converter.close()
+    
+    def _run_sequential(self) -> bool:
+        """逐个转换字体 (日志实时输出), 全部成功返回 True"""
+        # 转换器连带导入 FreeType 和各输出写入器, 推迟到首次转换时导入
+        # (main 启动后会在后台预先导入)
+        from core.simple_converter import SimpleFontConverter
+        
+        total_fonts = len(self.fonts)
+        converter = SimpleFontConverter()
+        cancelled = self._cancel_event.is_set
+        
+        try:
+            for i, font in enumerate(self.fonts):
+                if cancelled():
+                    self._log("\n转换已取消")
+                    self._emit_finished(False, "用户取消操作")
+                    return False
+                
+                error = self._convert_font(converter, i, font, self._log_lines)
+                if error is not None:
+                    self._emit_finished(False, error)
+                    return False
+        finally:
+            converter.close()
+        
+        return True
+    
+    def _run_parallel(self, groups: List[List[int]], workers: int) -> bool:
+        """
+        多个字体并行转换, 全部成功返回 True
+        
+        不同字体文件的输入和输出互不相关, 按文件分组后分发到线程池同时转换;
+        每个转换器内部按 CPU 核数平分渲染线程, 避免线程数超过核数。结果按
+        字体顺序收集, 日志保持与串行转换相同的顺序。
+        
+        Args:
+            groups: 按字体文件分组的字体序号
+            workers: 线程数
+        """
+        total_fonts = len(self.fonts)
+        jobs = max(1, (os.cpu_count() or 1) // workers)
+        self._set_progress(0, f"并行处理 {total_fonts} 个字体")
+        
+        results: List[Future] = [Future() for _ in range(total_fonts)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for indexes in groups:
+                pool.submit(self._convert_group, indexes, results, jobs)
+            
+            for result in results:
+                # 等待期间定时检查取消请求
+                while True:
+                    try:
+                        lines, error = result.result(timeout=_CANCEL_POLL_INTERVAL)
+                        break
+                    except FuturesTimeoutError:
+                        if self._cancel_event.is_set():
+                            # 未开始的字体不再转换, 正在转换的字体在下一步骤中止
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            self._log("\n转换已取消")
+                            self._emit_finished(False, "用户取消操作")
+                            return False
+                
+                self._log_lines(lines)
+                if error is not None:
+                    # 离开 with 时会等待正在转换的字体, 先请求它们中止
+                    self._cancel_event.set()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._emit_finished(False, error)
+                    return False
+        
+        return True
     
     def run(self):
         """执行转换任务"""
         try:
-            self.log_message.emit("=" * 60)
-            self.log_message.emit("开始字体转换")
-            self.log_message.emit("=" * 60)
+            config = self.config
             
             # 显示配置信息
-            self.log_message.emit(f"字体数量: {len(self.fonts)}")
-            self.log_message.emit(f"字体大小: {self.config.font_size}px")
-            self.log_message.emit(f"位深度: {self.config.bpp} bit")
-            self.log_message.emit(f"LVGL 版本: {self.config.lvgl_version}")
-            self.log_message.emit(f"输出格式: {self.config.output_format}")
-            self.log_message.emit(f"压缩方式: {self.config.compression}")
-            self.log_message.emit("")
+            self._log_lines([
+                "=" * 60,
+                "开始字体转换",
+                "=" * 60,
+                f"字体数量: {len(self.fonts)}",
+                f"字体大小: {config.font_size}px",
+                f"位深度: {config.bpp} bit",
+                f"LVGL 版本: {config.lvgl_version}",
+                f"输出格式: {config.output_format}",
+                f"压缩方式: {config.compression}",
+                "",
+            ])
             
             total_fonts = len(self.fonts)
+            self._font_pcts = [0] * total_fonts
+            os.makedirs(config.output_dir, exist_ok=True)
             
-            # 创建转换器
-            converter = SimpleFontConverter()
-            
-            # 设置进度回调
-            def progress_callback(message: str, percentage: int):
-                self.log_message.emit(f"  {message}")
-            
-            converter.set_progress_callback(progress_callback)
-            
+            # 按字体文件分组, 同一文件的字体不并行转换
+            groups: Dict[str, List[int]] = {}
             for i, font in enumerate(self.fonts):
-                if self.is_cancelled:
-                    self.log_message.emit("\n转换已取消")
-                    self.conversion_finished.emit(False, "用户取消操作")
-                    return
-                
-                # 更新进度
-                progress = int((i / total_fonts) * 100)
-                self.progress_updated.emit(progress, f"处理字体 {i+1}/{total_fonts}")
-                
-                # 显示字体信息
-                self.log_message.emit(f"[{i+1}/{total_fonts}] 处理字体: {font.display_name}")
-                self.log_message.emit(f"  路径: {font.path}")
-                self.log_message.emit(f"  范围: {', '.join(font.ranges) if font.ranges else '无'}")
-                self.log_message.emit(f"  符号: {font.symbols if font.symbols else '无'}")
-                self.log_message.emit(f"  字符数: {font.char_count}")
-                self.log_message.emit("")
-                
-                # 构建输出路径
-                os.makedirs(self.config.output_dir, exist_ok=True)
-                output_filename = f"{self.config.output_name}_{i}" if total_fonts > 1 else self.config.output_name
-                output_path = os.path.join(self.config.output_dir, output_filename)
-                
-                try:
-                    success = converter.convert_font(
-                        font_path=font.path,
-                        ranges=font.ranges,
-                        symbols=font.symbols,
-                        size=self.config.font_size,
-                        bpp=self.config.bpp,
-                        output_path=output_path,
-                        compression=self.config.compression,
-                        lvgl_version=self.config.lvgl_version,
-                        no_kerning=self.config.no_kerning,
-                        lcd_mode=self.config.lcd,
-                        lcd_v_mode=self.config.lcd_v
-                    )
-                    
-                    if success:
-                        self.log_message.emit(f"  ✓ 转换完成: {output_path}.c")
-                    else:
-                        self.log_message.emit(f"  ✗ 转换失败")
-                        self.conversion_finished.emit(False, f"字体 {font.display_name} 转换失败")
-                        return
-                        
-                except FileNotFoundError as e:
-                    error_msg = f"文件不存在: {str(e)}\n建议: 检查字体文件路径是否正确"
-                    self.log_message.emit(f"\n  ✗ 错误: {error_msg}")
-                    self.conversion_finished.emit(False, error_msg)
-                    return
-                    
-                except PermissionError as e:
-                    error_msg = f"权限错误: {str(e)}\n建议: 检查输出目录的写入权限"
-                    self.log_message.emit(f"\n  ✗ 错误: {error_msg}")
-                    self.conversion_finished.emit(False, error_msg)
-                    return
-                    
-                except ValueError as e:
-                    error_msg = f"参数错误: {str(e)}\n建议: 检查字体大小、BPP 等配置参数是否有效"
-                    self.log_message.emit(f"\n  ✗ 错误: {error_msg}")
-                    self.conversion_finished.emit(False, error_msg)
-                    return
-                    
-                except Exception as e:
-                    error_msg = f"转换失败: {str(e)}\n建议: 检查字体文件是否有效,或尝试更改配置参数"
-                    self.log_message.emit(f"\n  ✗ 错误: {error_msg}")
-                    self.conversion_finished.emit(False, error_msg)
-                    return
-                
-                self.log_message.emit("")
+                groups.setdefault(font.path, []).append(i)
+            
+            # 只有一个字体文件 (或单核) 时串行转换, 日志实时输出
+            workers = min(len(groups), os.cpu_count() or 1)
+            if workers > 1:
+                completed = self._run_parallel(list(groups.values()), workers)
+            else:
+                completed = self._run_sequential()
+            if not completed:
+                return
             
             # 完成
-            self.progress_updated.emit(100, "转换完成")
-            self.log_message.emit("=" * 60)
-            self.log_message.emit("所有字体转换完成!")
-            self.log_message.emit("=" * 60)
-            self.conversion_finished.emit(True, f"成功转换 {total_fonts} 个字体")
+            self._set_progress(100, "转换完成")
+            self._log_lines([
+                "=" * 60,
+                "所有字体转换完成!",
+                "=" * 60,
+            ])
+            self._emit_finished(True, f"成功转换 {total_fonts} 个字体")
             
         except Exception as e:
             error_msg = f"转换失败: {str(e)}"
-            self.log_message.emit(f"\n错误: {error_msg}")
-            self.conversion_finished.emit(False, error_msg)
+            self._log(f"\n错误: {error_msg}")
+            self._emit_finished(False, error_msg)
             logger.error(error_msg, exc_info=True)
     
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+    
     def cancel(self):
         """取消转换"""
-        self.is_cancelled = True
+        self._cancel_event.set()
         logger.info("转换线程取消请求")
 
 
@@ -160,6 +401,9 @@ class ConvertDialog(QDialog):
         self.convert_thread: Optional[ConvertThread] = None
         self.is_finished = False
         
+        # 已创建的确认对话框 (按标题), 重复取消/关闭时复用
+        self._confirm_boxes: Dict[str, QMessageBox] = {}
+        
         self._init_ui()
         logger.info("转换对话框初始化完成")
     
@@ -174,7 +418,7 @@ class ConvertDialog(QDialog):
         
         # 状态标签
         self.status_label = QLabel("准备转换...")
-        self.status_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.status_label.setStyleSheet(_STATUS_STYLE)
         layout.addWidget(self.status_label)
         
         # 进度条
@@ -188,10 +432,13 @@ class ConvertDialog(QDialog):
         log_label = QLabel("转换日志:")
         layout.addWidget(log_label)
         
-        self.log_text = QTextEdit()
+        # 纯文本日志: 无富文本排版, 超过上限的旧行自动丢弃
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Monospace", 9))
-        self.log_text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.log_text.setFont(_log_font())
+        self.log_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.log_text.setMaximumBlockCount(_LOG_MAX_LINES)
+        self.log_text.setCenterOnScroll(False)
         layout.addWidget(self.log_text)
         
         # 按钮
@@ -208,6 +455,11 @@ class ConvertDialog(QDialog):
         button_layout.addWidget(self.close_button)
         
         layout.addLayout(button_layout)
+        
+        # 定时读取转换进度
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(_PROGRESS_POLL_MS)
+        self._poll_timer.timeout.connect(self._poll_progress)
     
     def start_conversion(self):
         """开始转换"""
@@ -215,42 +467,45 @@ class ConvertDialog(QDialog):
         self.convert_thread = ConvertThread(self.fonts, self.config)
         
         # 连接信号
-        self.convert_thread.progress_updated.connect(self._on_progress_updated)
-        self.convert_thread.log_message.connect(self._on_log_message)
+        self.convert_thread.log_batch.connect(self._on_log_batch)
         self.convert_thread.conversion_finished.connect(self._on_conversion_finished)
         
         # 启动线程
         self.convert_thread.start()
+        self._poll_timer.start()
         logger.info("转换线程已启动")
     
-    def _on_progress_updated(self, value: int, message: str):
-        """进度更新"""
+    def _poll_progress(self):
+        """读取并显示最新进度"""
+        state = self.convert_thread.take_progress() if self.convert_thread else None
+        if state is None:
+            return
+        value, message = state
+        # setValue 对相同值不会重绘, setText 则总会重新布局, 需自行比较
         self.progress_bar.setValue(value)
-        self.status_label.setText(message)
+        if message != self.status_label.text():
+            self.status_label.setText(message)
     
-    def _on_log_message(self, message: str):
-        """添加日志消息"""
-        self.log_text.append(message)
-        # 自动滚动到底部
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.log_text.setTextCursor(cursor)
+    def _on_log_batch(self, messages: list):
+        """添加一批日志消息 (整批追加, 只重绘一次)"""
+        # 滚动条位于底部时 appendPlainText 会自动滚动到底部
+        self.log_text.appendPlainText("\n".join(messages))
     
     def _on_conversion_finished(self, success: bool, message: str):
         """转换完成"""
         self.is_finished = True
         
+        # 显示最后的进度后停止读取
+        self._poll_timer.stop()
+        self._poll_progress()
+        
         if success:
             self.status_label.setText("✓ " + message)
-            self.status_label.setStyleSheet(
-                "font-weight: bold; font-size: 14px; color: green;"
-            )
+            self.status_label.setStyleSheet(_STATUS_STYLE_OK)
             logger.info(f"转换成功: {message}")
         else:
             self.status_label.setText("✗ " + message)
-            self.status_label.setStyleSheet(
-                "font-weight: bold; font-size: 14px; color: red;"
-            )
+            self.status_label.setStyleSheet(_STATUS_STYLE_FAIL)
             logger.error(f"转换失败: {message}")
         
         # 更新按钮状态
@@ -258,21 +513,29 @@ class ConvertDialog(QDialog):
         self.close_button.setEnabled(True)
         self.close_button.setFocus()
     
+    def _confirm(self, title: str, text: str) -> bool:
+        """
+        显示是/否确认对话框, 默认选中"否"
+        
+        对话框首次使用时创建, 之后按标题复用, 不再每次重新构建。
+        
+        Returns:
+            用户选择"是"时返回 True
+        """
+        box = self._confirm_boxes.get(title)
+        if box is None:
+            box = QMessageBox(QMessageBox.Icon.Question, title, text, _YES_NO, self)
+            box.setDefaultButton(QMessageBox.StandardButton.No)
+            self._confirm_boxes[title] = box
+        return box.exec() == QMessageBox.StandardButton.Yes
+    
     def _on_cancel(self):
         """取消转换"""
         if self.is_finished:
             self.reject()
             return
         
-        reply = QMessageBox.question(
-            self,
-            "确认取消",
-            "确定要取消转换吗?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
+        if self._confirm("确认取消", "确定要取消转换吗?"):
             if self.convert_thread and self.convert_thread.isRunning():
                 self.status_label.setText("正在取消...")
                 self.cancel_button.setEnabled(False)
@@ -282,17 +545,33 @@ class ConvertDialog(QDialog):
     def closeEvent(self, event):
         """关闭事件"""
         if not self.is_finished and self.convert_thread and self.convert_thread.isRunning():
-            reply = QMessageBox.question(
-                self,
-                "确认关闭",
-                "转换正在进行中，确定要关闭吗?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.No
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                self.convert_thread.cancel()
-                self.convert_thread.wait()
+            if self._confirm("确认关闭", "转换正在进行中，确定要关闭吗?"):
+                # 不在界面线程中等待转换线程退出 (会卡住界面直到当前步骤结束):
+                # 直接关闭对话框, 线程交给 QApplication 持有, 结束后再释放
+                thread = self.convert_thread
+                
+                # 先断开线程与对话框的连接并停止读取进度, 对话框不再依赖线程
+                thread.log_batch.disconnect(self._on_log_batch)
+                thread.conversion_finished.disconnect(self._on_conversion_finished)
+                self._poll_timer.stop()
+                
+                thread.cancel()
+                app = QApplication.instance()
+                thread.setParent(app)
+                # 先连接再检查, 线程恰好在两者之间结束时也能被释放
+                # (重复调用 deleteLater 是安全的)
+                thread.finished.connect(thread.deleteLater)
+                if thread.isFinished():
+                    thread.deleteLater()
+                else:
+                    # 程序退出时仍需等待线程结束, 否则销毁运行中的 QThread 会导致崩溃。
+                    # 线程对象可能已被释放, 不能直接连接 thread.wait
+                    def wait_on_quit():
+                        if not sip.isdeleted(thread):
+                            thread.wait()
+                    
+                    app.aboutToQuit.connect(wait_on_quit)
+                self.deleteLater()
                 event.accept()
             else:
                 event.ignore()
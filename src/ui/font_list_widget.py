@@ -20,17 +20,20 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from core._range_utils import CharCountCache
 from utils.logger import get_logger
 
 logger = get_logger()
 
 
 @dataclass
-class FontSource:
+class FontSource(CharCountCache):
     """字体源数据类"""
     path: str
     ranges: List[str] = field(default_factory=list)  # ["0x30-0x39", "0x41-0x5A"]
     symbols: str = ""  # "©®™"
+    # 缓存的字符数, ranges/symbols 被重新赋值时失效
+    _char_count: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     def __str__(self):
         return Path(self.path).name
@@ -40,22 +43,6 @@ class FontSource:
         """显示名称"""
         return Path(self.path).name
     
-    @property
-    def char_count(self) -> int:
-        """估算字符数"""
-        count = len(self.symbols)
-        for r in self.ranges:
-            if '-' in r:
-                parts = r.split('-')
-                if len(parts) == 2:
-                    try:
-                        start = int(parts[0], 0)
-                        end = int(parts[1], 0)
-                        count += (end - start + 1)
-                    except:
-                        pass
-        return count
-    
     def to_dict(self):
         """转换为字典用于序列化"""
         return {
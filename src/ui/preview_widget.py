@@ -265,7 +265,8 @@ class PreviewWidget(QWidget):
         try:
             # 加载字体
             if self.font_loader:
-                # 卸载之前的字体
+                # 卸载之前的字体 (连同其 Face 一起关闭, 渲染器不能再使用)
+                self.renderer = None
                 self.font_loader = None
             
             self.font_loader = FontLoader()
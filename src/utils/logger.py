@@ -120,6 +120,24 @@ class Logger:
         """Log an exception with traceback"""
         self.logger.exception(message)
     
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Check whether a message at this level would be emitted
+        
+        The logger itself accepts everything from DEBUG up, so the
+        handler levels decide. Use this to skip building expensive
+        messages in hot loops.
+        
+        Args:
+            level: Logging level (e.g., logging.DEBUG, logging.INFO)
+            
+        Returns:
+            True if the logger and at least one handler accept the level
+        """
+        return self.logger.isEnabledFor(level) and any(
+            level >= handler.level for handler in self.logger.handlers
+        )
+    
     def set_console_level(self, level: int) -> None:
         """
         Set the console log level
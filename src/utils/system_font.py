@@ -0,0 +1,57 @@
+"""
+System font resolver for LVFontConv
+Locates a usable system font and caches the result across runs
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+# Candidate system fonts, checked in order
+SYSTEM_FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux (Debian/Ubuntu)
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",              # Linux (Arch)
+    "/System/Library/Fonts/Helvetica.ttc",              # macOS
+    "/Library/Fonts/Arial.ttf",                         # macOS
+    "C:\\Windows\\Fonts\\arial.ttf",                    # Windows
+)
+
+# Resolved path is remembered here between runs
+CACHE_FILE = Path.home() / '.lvfontconv' / 'syspath.txt'
+
+
+def resolve_system_font(
+    candidates: Sequence[str] = SYSTEM_FONT_CANDIDATES
+) -> Optional[str]:
+    """
+    Find the first existing system font
+
+    The previously resolved path is read from the cache file and reused
+    as long as it still exists; otherwise the candidates are scanned
+    again and the cache is refreshed.
+
+    Args:
+        candidates: Font paths to try, in order of preference
+
+    Returns:
+        Path of the first existing font, or None if none was found
+    """
+    try:
+        cached = CACHE_FILE.read_text(encoding='utf-8').strip()
+    except OSError:
+        cached = ''
+
+    if cached in candidates and os.path.isfile(cached):
+        return cached
+
+    for path in candidates:
+        if os.path.isfile(path):
+            try:
+                CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                CACHE_FILE.write_text(path, encoding='utf-8')
+            except OSError:
+                pass  # Cache is best-effort only
+            return path
+
+    return None
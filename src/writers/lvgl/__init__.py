@@ -13,7 +13,7 @@ from .structures import (
     CmapSubtable,
     GlyphData
 )
-from .compress import compress_rle, compress_rle_with_xor
+from .compress import compress_rle, compress_rle_into, compress_rle_with_xor
 from .writer import LVGLWriter
 
 __all__ = [
@@ -25,6 +25,7 @@ __all__ = [
     'CmapSubtable',
     'GlyphData',
     'compress_rle',
+    'compress_rle_into',
     'compress_rle_with_xor',
     'LVGLWriter'
 ]
@@ -0,0 +1,130 @@
+"""
+位图打包内核
+
+将每像素一个字节的位图按 bpp 打包为 LVGL 位图字节流 (MSB 优先)。
+安装 numba 时使用按 bpp 特化的编译内核, 否则使用 NumPy 实现。
+
+供 LVGLWriter (无压缩输出) 使用。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba 为可选依赖, 未安装时使用 NumPy 实现
+    njit = None
+
+
+def _pack_rows_1bit(pixels: np.ndarray, out: np.ndarray) -> None:
+    """1 bpp 逐行打包内核: 每字节八个像素, MSB 优先"""
+    height, width = pixels.shape
+    for y in range(height):
+        for x in range(width):
+            out[y, x >> 3] |= (pixels[y, x] & 0x01) << (7 - (x & 7))
+
+
+def _pack_rows_2bit(pixels: np.ndarray, out: np.ndarray) -> None:
+    """2 bpp 逐行打包内核: 每字节四个像素, MSB 优先"""
+    height, width = pixels.shape
+    for y in range(height):
+        for x in range(width):
+            out[y, x >> 2] |= (pixels[y, x] & 0x03) << (6 - 2 * (x & 3))
+
+
+def _pack_rows_4bit(pixels: np.ndarray, out: np.ndarray) -> None:
+    """
+    4 bpp 逐行打包内核: 每字节两个像素, 高半字节在前
+
+    奇数宽度时行末像素单独写入最后一个字节的高半字节。
+    """
+    height, width = pixels.shape
+    half = width >> 1
+    for y in range(height):
+        for x in range(half):
+            out[y, x] = ((pixels[y, 2 * x] & 0x0F) << 4) | (pixels[y, 2 * x + 1] & 0x0F)
+        if width & 1:
+            out[y, half] = (pixels[y, width - 1] & 0x0F) << 4
+
+
+def _pack_rows_8bit(pixels: np.ndarray, out: np.ndarray) -> None:
+    """8 bpp 逐行打包内核: 逐字节复制"""
+    height, width = pixels.shape
+    for y in range(height):
+        for x in range(width):
+            out[y, x] = pixels[y, x]
+
+
+if njit is not None:
+    # 每个 bpp 单独编译, numba 可针对固定的移位常量完全特化。
+    # 单个字形只有几十行, 并行调度的开销大于收益, 因此不使用 parallel
+    _ROW_KERNELS = {
+        bpp: njit(cache=True, boundscheck=False)(kernel)
+        for bpp, kernel in (
+            (1, _pack_rows_1bit),
+            (2, _pack_rows_2bit),
+            (4, _pack_rows_4bit),
+            (8, _pack_rows_8bit),
+        )
+    }
+else:
+    _ROW_KERNELS = {}
+
+
+def _pack_rows_numpy(pixels: np.ndarray, out: np.ndarray, bpp: int) -> None:
+    """NumPy 实现: 补齐到整字节后按 MSB 优先移位并按位或"""
+    if bpp == 8:
+        packed = pixels
+    elif bpp == 1:
+        packed = np.packbits(pixels & 0x01, axis=1)
+    else:
+        pixels_per_byte = 8 // bpp
+        shifts = (8 - bpp) - bpp * np.arange(pixels_per_byte, dtype=np.uint8)
+        height, width = pixels.shape
+        pad = -width % pixels_per_byte
+        rows = np.pad(pixels & ((1 << bpp) - 1), ((0, 0), (0, pad)))
+        groups = rows.reshape(height, rows.shape[1] // pixels_per_byte,
+                              pixels_per_byte) << shifts
+        packed = np.bitwise_or.reduce(groups, axis=2)
+    out[:, :packed.shape[1]] = packed
+
+
+def pack_rows(pixels: np.ndarray, out: np.ndarray, bpp: int) -> None:
+    """
+    将 (高, 宽) 像素逐行打包到 out 中
+
+    Args:
+        pixels: 2D 像素数组 (每像素一个字节)
+        out: 预先清零的 (高, 行字节数) uint8 数组, 行字节数不小于
+             ceil(宽 * bpp / 8), 多余部分保持为 0 (行对齐填充)
+        bpp: 每像素位数 (1, 2, 4, 8)
+    """
+    pixels = np.asarray(pixels).astype(np.uint8, copy=False)
+    kernel = _ROW_KERNELS.get(bpp)
+    if kernel is not None:
+        kernel(pixels, out)
+    else:
+        _pack_rows_numpy(pixels, out, bpp)
+
+
+def pack_bpp(bitmap: np.ndarray, bpp: int) -> np.ndarray:
+    """
+    紧凑打包位图: 所有像素连续排列, 仅在末尾补齐到整字节
+
+    Args:
+        bitmap: 像素数组 (每像素一个字节)
+        bpp: 每像素位数 (1, 2, 4, 8)
+
+    Returns:
+        长度为 ceil(像素数 * bpp / 8) 的 uint8 数组
+
+    Raises:
+        ValueError: bpp 不受支持
+    """
+    if bpp not in (1, 2, 4, 8):
+        raise ValueError(f"不支持的 BPP: {bpp}")
+
+    # 紧凑打包相当于把所有行拼成一整行再逐行打包
+    flat = np.ascontiguousarray(bitmap, dtype=np.uint8).reshape(1, -1)
+    out = np.zeros((1, (flat.shape[1] * bpp + 7) // 8), dtype=np.uint8)
+    pack_rows(flat, out, bpp)
+    return out.ravel()
@@ -19,6 +19,11 @@ from typing import List, Optional
 import numpy as np
 from io import BytesIO
 
+try:
+    from numba import njit
+except ImportError:  # numba 为可选依赖, 未安装时使用纯 Python 实现
+    njit = None
+
 
 class BitStream:
     """
@@ -139,6 +144,9 @@ def compress_rle(
     if len(pixels) == 0:
         return b''
     
+    if _rle_encode_jit is not None:
+        return _compress_rle_jit(pixels, bpp, min_repeat)
+    
     # 常量定义
     RLE_SKIP_COUNT = min_repeat          # 最小重复数进入 RLE
     RLE_BIT_COLLAPSED_COUNT = 10         # 使用 1-bit 标记的最大重复数
@@ -192,7 +200,149 @@ def compress_rle(
     return bs.flush()
 
 
-def apply_xor_prefilter(pixels: np.ndarray) -> np.ndarray:
+def _write_bits_u8(out: np.ndarray, state: np.ndarray, value: int, num_bits: int) -> None:
+    """
+    向字节缓冲区按位写入 (MSB 优先, 与 BitStream.write_bits 一致)
+    
+    state: [已写满的字节数, 当前字节, 当前字节中的位位置]
+    """
+    value &= (1 << num_bits) - 1
+    for i in range(num_bits - 1, -1, -1):
+        state[1] = (state[1] << 1) | ((value >> i) & 1)
+        state[2] += 1
+        if state[2] == 8:
+            out[state[0]] = state[1]
+            state[0] += 1
+            state[1] = 0
+            state[2] = 0
+
+
+def _rle_encode_u8(pixels: np.ndarray, bpp: int, min_repeat: int, out: np.ndarray) -> int:
+    """
+    RLE 编码内核 (与 compress_rle 的纯 Python 实现逐位等价)
+    
+    Args:
+        pixels: 像素数组 (一维 uint8)
+        bpp: 每像素位数
+        min_repeat: 进入 RLE 模式的最小重复次数
+        out: 输出缓冲区, 需足够容纳最坏情况
+        
+    Returns:
+        写入 out 的字节数
+    """
+    bit_collapsed_count = 10
+    counter_bits = 6
+    max_repeats = (1 << counter_bits) - 1 + bit_collapsed_count + 1
+    
+    state = np.zeros(3, dtype=np.int64)
+    n = pixels.shape[0]
+    offset = 0
+    
+    while offset < n:
+        pixel = pixels[offset]
+        same = 1
+        while offset + same < n and pixels[offset + same] == pixel:
+            same += 1
+        
+        if same > max_repeats + min_repeat:
+            same = max_repeats + min_repeat
+        
+        offset += same
+        
+        if same <= min_repeat:
+            for _ in range(same):
+                _write_bits_u8(out, state, pixel, bpp)
+            continue
+        
+        for _ in range(min_repeat):
+            _write_bits_u8(out, state, pixel, bpp)
+        
+        same -= min_repeat
+        
+        if same <= bit_collapsed_count:
+            _write_bits_u8(out, state, pixel, bpp)
+            for i in range(same):
+                _write_bits_u8(out, state, 1 if i < same - 1 else 0, 1)
+            continue
+        
+        same -= bit_collapsed_count + 1
+        
+        _write_bits_u8(out, state, pixel, bpp)
+        for _ in range(bit_collapsed_count + 1):
+            _write_bits_u8(out, state, 1, 1)
+        _write_bits_u8(out, state, same, counter_bits)
+    
+    # 填充最后一个未写满的字节
+    if state[2] > 0:
+        out[state[0]] = (state[1] << (8 - state[2])) & 0xFF
+        state[0] += 1
+    
+    return state[0]
+
+
+if njit is not None:
+    _write_bits_u8 = njit(cache=True)(_write_bits_u8)
+    _rle_encode_jit = njit(cache=True)(_rle_encode_u8)
+else:
+    _rle_encode_jit = None
+
+
+def rle_buffer_size(pixel_count: int, bpp: int) -> int:
+    """
+    RLE 输出的最坏情况字节数
+    
+    每个像素最多写入 bpp 位外加 1 个标记位, 另加末尾填充。
+    """
+    return pixel_count * (bpp + 1) // 8 + 2
+
+
+def _compress_rle_jit(pixels: np.ndarray, bpp: int, min_repeat: int) -> bytes:
+    """使用 numba 编译的内核执行 RLE 压缩"""
+    src = np.ascontiguousarray(pixels, dtype=np.uint8).ravel()
+    out = np.empty(rle_buffer_size(len(src), bpp), dtype=np.uint8)
+    size = _rle_encode_jit(src, bpp, min_repeat, out)
+    return out[:size].tobytes()
+
+
+def compress_rle_into(
+    pixels: np.ndarray,
+    bpp: int,
+    out: np.ndarray,
+    min_repeat: int = 1
+) -> int:
+    """
+    RLE 压缩到调用方提供的缓冲区（无 XOR 预过滤）
+    
+    逐字形压缩时可复用同一个缓冲区, 避免每个字形分配一次输出。
+    压缩本身受内存带宽限制, 减少分配和临时对象是主要收益。
+    
+    Args:
+        pixels: 像素数组
+        bpp: 每像素位数 (1-4)
+        out: uint8 输出缓冲区, 长度不小于 rle_buffer_size(像素数, bpp)
+        min_repeat: 进入 RLE 模式的最小重复次数
+        
+    Returns:
+        写入 out 的字节数
+    """
+    if bpp < 1 or bpp > 4:
+        raise ValueError(f"BPP 必须在 1-4 之间，当前为 {bpp}")
+    
+    src = np.ascontiguousarray(pixels, dtype=np.uint8).ravel()
+    if len(src) == 0:
+        return 0
+    if len(out) < rle_buffer_size(len(src), bpp):
+        raise ValueError(f"输出缓冲区过小: {len(out)} < {rle_buffer_size(len(src), bpp)}")
+    
+    if _rle_encode_jit is not None:
+        return int(_rle_encode_jit(src, bpp, min_repeat, out))
+    
+    data = compress_rle(src, bpp, min_repeat)
+    out[:len(data)] = np.frombuffer(data, dtype=np.uint8)
+    return len(data)
+
+
+def apply_xor_prefilter(pixels: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     应用 XOR 预过滤器
     
@@ -201,9 +351,10 @@ def apply_xor_prefilter(pixels: np.ndarray) -> np.ndarray:
     
     Args:
         pixels: 像素数组 (二维: height x width)
+        out: 可选的输出数组 (与 pixels 形状相同且连续), 用于复用缓冲区
         
     Returns:
-        过滤后的像素数组 (一维)
+        过滤后的像素数组 (一维; 传入 out 时为 out 的视图)
     """
     if pixels.ndim != 2:
         raise ValueError("XOR 预过滤需要二维数组 (height, width)")
@@ -212,17 +363,15 @@ def apply_xor_prefilter(pixels: np.ndarray) -> np.ndarray:
     if pixels.size == 0:
         return np.array([], dtype=pixels.dtype)
     
-    height, width = pixels.shape
-    filtered = np.zeros_like(pixels)
+    filtered = np.empty_like(pixels) if out is None else out
     
     # 第一行不变
     filtered[0] = pixels[0]
     
     # 后续行与前一行 XOR
-    for y in range(1, height):
-        filtered[y] = pixels[y] ^ pixels[y - 1]
+    np.bitwise_xor(pixels[1:], pixels[:-1], out=filtered[1:])
     
-    return filtered.flatten()
+    return filtered.ravel()
 
 
 def compress_rle_with_xor(
@@ -8,12 +8,17 @@ LVGL 字体格式数据结构定义
 - lv_font_conv/doc/font_spec.md
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 from enum import IntEnum
 import numpy as np
 
 
+# 大量创建的数据类在 Python 3.10+ 上使用 __slots__ (节省内存, 加快属性访问)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class CompressionType(IntEnum):
     """压缩算法类型"""
     NONE = 0           # 无压缩
@@ -65,7 +70,7 @@ class CmapSubtable:
         return 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GlyphData:
     """
     字形数据
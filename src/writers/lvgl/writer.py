@@ -17,7 +17,8 @@ from .structures import (
     CompressionType,
     SubpixelMode
 )
-from .compress import compress_rle, compress_rle_with_xor
+from .compress import apply_xor_prefilter, compress_rle_into, rle_buffer_size
+from ._fastpack import pack_bpp
 
 
 class LVGLWriter:
@@ -135,6 +136,13 @@ class LVGLWriter:
         
         # 生成位图数据
         bitmap_arrays = []
+        bpp = font.head.bpp
+        
+        # 压缩时所有字形复用同一组缓冲区 (按最大字形分配), 不再逐字形分配
+        max_pixels = max((glyph.bitmap.size for glyph in glyf.glyphs), default=0)
+        xor_buf = np.empty(max_pixels, dtype=np.uint8)
+        rle_buf = np.empty(rle_buffer_size(max_pixels, bpp), dtype=np.uint8)
+        
         for glyph in glyf.glyphs:
             if glyph.glyph_id == 0:
                 continue  # 跳过保留字形
@@ -144,17 +152,18 @@ class LVGLWriter:
             
             # 压缩位图
             if font.head.compression_id == CompressionType.NONE:
-                bitmap_data = self._flatten_bitmap(glyph.bitmap, font.head.bpp)
-            elif font.head.compression_id == CompressionType.RLE:
-                bitmap_data = compress_rle_with_xor(
-                    glyph.bitmap,
-                    bpp=font.head.bpp,
-                    width=glyph.box_w,
-                    height=glyph.box_h
-                )
-            else:  # RLE_NO_PREFILTER
-                flat = glyph.bitmap.flatten()
-                bitmap_data = compress_rle(flat, bpp=font.head.bpp)
+                bitmap_data = self._flatten_bitmap(glyph.bitmap, bpp)
+            else:
+                pixels = glyph.bitmap
+                if font.head.compression_id == CompressionType.RLE:
+                    pixels = pixels.reshape(glyph.box_h, glyph.box_w)
+                    pixels = apply_xor_prefilter(
+                        pixels, out=xor_buf[:pixels.size].reshape(pixels.shape)
+                    )
+                # RLE_NO_PREFILTER 直接压缩原始像素
+                size = compress_rle_into(pixels, bpp, rle_buf)
+                # memoryview 切片不复制, 仅在格式化期间使用
+                bitmap_data = rle_buf.data[:size]
             
             if len(bitmap_data) > 0:
                 hex_data = self._format_hex_array(bitmap_data)
@@ -421,43 +430,10 @@ lv_font_t {font.name} = {{
         - 2 bpp: 4 像素/字节
         - 4 bpp: 2 像素/字节
         - 8 bpp: 1 像素/字节
-        """
-        flat = bitmap.flatten()
         
-        if bpp == 8:
-            # 8-bit: 1 像素/字节,直接返回
-            return flat.tobytes()
-        elif bpp == 4:
-            # 4-bit: 2 像素/字节
-            # 注意: 原版使用 BitStream 大端序(MSB first),所以第一个像素在高nibble
-            packed = []
-            for i in range(0, len(flat), 2):
-                high = (flat[i] & 0x0F) << 4  # 高4位(第一个像素)
-                low = flat[i+1] & 0x0F if i+1 < len(flat) else 0  # 低4位(第二个像素)
-                packed.append(high | low)
-            return bytes(packed)
-        elif bpp == 2:
-            # 2-bit: 4 像素/字节
-            packed = []
-            for i in range(0, len(flat), 4):
-                byte = 0
-                for j in range(4):
-                    if i+j < len(flat):
-                        byte |= (flat[i+j] & 0x03) << (6 - j*2)
-                packed.append(byte)
-            return bytes(packed)
-        elif bpp == 1:
-            # 1-bit: 8 像素/字节
-            packed = []
-            for i in range(0, len(flat), 8):
-                byte = 0
-                for j in range(8):
-                    if i+j < len(flat):
-                        byte |= (flat[i+j] & 0x01) << (7 - j)
-                packed.append(byte)
-            return bytes(packed)
-        else:
-            raise ValueError(f"不支持的 BPP: {bpp}")
+        与原版 BitStream 一致按 MSB 优先打包 (第一个像素在最高位)。
+        """
+        return pack_bpp(bitmap, bpp).tobytes()
     
     def _format_hex_array(self, data: bytes, cols: int = 12) -> str:
         """格式化字节数组为十六进制 C 数组"""
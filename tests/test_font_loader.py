@@ -2,6 +2,7 @@
 Unit tests for font_loader module
 """
 
+import os
 import pytest
 import sys
 from pathlib import Path
@@ -9,7 +10,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from core.font_loader import FontLoader, FontInfo
+from core.font_loader import FontLoader, FontInfo, open_face, close_face
 
 
 class TestFontLoader:
@@ -167,6 +168,108 @@ class TestFontLoaderWithSystemFont:
         assert system_font_path not in loader._loaded_fonts
         assert system_font_path not in loader._freetype_faces
     
+    def test_supported_chars_reused_on_reload(self, system_font_path):
+        """Test reloading an unchanged font reuses its supported characters"""
+        if system_font_path is None:
+            pytest.skip("No suitable system font found")
+        
+        loader = FontLoader()
+        info1 = loader.load_font(system_font_path)
+        info2 = loader.load_font(system_font_path)
+        
+        assert isinstance(info1.supported_chars, frozenset)
+        assert 0x41 in info1.supported_chars
+        assert info2.supported_chars is info1.supported_chars
+    
+    def test_reload_after_file_replaced(self, tmp_path):
+        """Test reloading a font whose file was replaced reports the new font"""
+        font_dir = Path("/usr/share/fonts/truetype/dejavu")
+        old_font = font_dir / "DejaVuSansMono.ttf"
+        new_font = font_dir / "DejaVuSerif.ttf"
+        if not (old_font.exists() and new_font.exists()):
+            pytest.skip("DejaVu fonts not found")
+        
+        expected = FontLoader().load_font(str(new_font))
+        
+        font_path = tmp_path / "font.ttf"
+        font_path.write_bytes(old_font.read_bytes())
+        loader = FontLoader()
+        info1 = loader.load_font(str(font_path))
+        
+        font_path.write_bytes(new_font.read_bytes())
+        # Make sure the modification time changes even on coarse clocks
+        st = os.stat(font_path)
+        os.utime(font_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        info2 = loader.load_font(str(font_path))
+        
+        assert info2.family_name == expected.family_name != info1.family_name
+        assert info2.supported_chars == expected.supported_chars
+        assert len(info2.supported_chars) != len(info1.supported_chars)
+    
+    def test_font_info_shared_across_loaders(self, system_font_path):
+        """Test font info is reused by other loaders until the cache is cleared"""
+        if system_font_path is None:
+            pytest.skip("No suitable system font found")
+        
+        FontLoader.clear_cache()
+        loader1 = FontLoader()
+        info1 = loader1.load_font(system_font_path)
+        
+        loader2 = FontLoader()
+        info2 = loader2.load_font(system_font_path)
+        assert info2 == info1
+        assert info2.supported_chars is info1.supported_chars
+        
+        FontLoader.clear_cache()
+        loader3 = FontLoader()
+        info3 = loader3.load_font(system_font_path)
+        assert info3 == info1
+        assert info3.supported_chars is not info1.supported_chars
+    
+    def test_faces_not_shared_across_loaders(self, system_font_path):
+        """Test every loader gets its own FreeType face and TTFont"""
+        if system_font_path is None:
+            pytest.skip("No suitable system font found")
+        
+        loader1 = FontLoader()
+        loader1.load_font(system_font_path)
+        loader2 = FontLoader()
+        loader2.load_font(system_font_path)
+        
+        face1 = loader1.get_freetype_face(system_font_path)
+        face2 = loader2.get_freetype_face(system_font_path)
+        assert face1 is not face2
+        assert loader1.get_font(system_font_path) is not loader2.get_font(system_font_path)
+        
+        # Resizing one face must not affect the other
+        face1.set_pixel_sizes(0, 16)
+        face2.set_pixel_sizes(0, 30)
+        assert face1.size.y_ppem == 16
+    
+    def test_open_and_close_face(self, system_font_path):
+        """Test faces are released by close_face and closing twice is a no-op"""
+        if system_font_path is None:
+            pytest.skip("No suitable system font found")
+        
+        face = open_face(system_font_path)
+        assert face.get_char_index(0x41) != 0
+        
+        close_face(face)
+        assert face._FT_Face is None
+        close_face(face)
+    
+    def test_unload_closes_face(self, system_font_path):
+        """Test unloading a font closes the loader's FreeType face"""
+        if system_font_path is None:
+            pytest.skip("No suitable system font found")
+        
+        loader = FontLoader()
+        loader.load_font(system_font_path)
+        face = loader.get_freetype_face(system_font_path)
+        
+        loader.unload_font(system_font_path)
+        assert face._FT_Face is None
+    
     def test_multiple_fonts(self, system_font_path):
         """Test loading multiple fonts"""
         if system_font_path is None:
@@ -11,7 +11,7 @@ import freetype
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from core.glyph_renderer import GlyphRenderer, GlyphData
+from core.glyph_renderer import GlyphRenderer, GlyphData, _blank_bitmap
 
 
 class TestGlyphData:
@@ -97,6 +97,8 @@ class TestGlyphRenderer:
         for bpp in [1, 2, 3, 4]:
             renderer.set_bpp(bpp)
             assert renderer._current_bpp == bpp
+            assert np.array_equal(renderer._lut[np.arange(256, dtype=np.uint8)],
+                                  renderer._convert_bit_depth(np.arange(256, dtype=np.uint8), bpp))
     
     def test_set_bpp_invalid(self):
         """Test setting invalid bpp"""
@@ -119,6 +121,11 @@ class TestGlyphRenderer:
         # Values < 128 should be 0, >= 128 should be 1
         expected = np.array([[0, 0, 0, 1, 1, 1]], dtype=np.uint8)
         assert np.array_equal(result, expected)
+        
+        # Custom threshold
+        result = renderer._convert_to_1bit(bitmap, threshold=64)
+        assert result.dtype == np.uint8
+        assert result.tolist() == [[0, 1, 1, 1, 1, 1]]
     
     def test_convert_to_2bit(self):
         """Test 2-bit conversion"""
@@ -153,6 +160,34 @@ class TestGlyphRenderer:
         assert result.max() <= 15
         assert result.min() >= 0
     
+    def test_convert_bit_depth_matches_shift(self):
+        """Test LUT conversion matches plain bit shifting for every level"""
+        renderer = GlyphRenderer()
+        bitmap = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        
+        for bpp in (2, 3, 4):
+            result = renderer._convert_bit_depth(bitmap, bpp)
+            assert result.dtype == np.uint8
+            assert np.array_equal(result, bitmap >> (8 - bpp))
+        
+        result = renderer._convert_bit_depth(bitmap, 1)
+        assert np.array_equal(result, (bitmap >= 128).astype(np.uint8))
+    
+    def test_convert_bit_depth_packed_1bit(self):
+        """Test 1-bit output packed MSB first with rows padded to bytes"""
+        renderer = GlyphRenderer()
+        bitmap = np.array([[255, 0, 200, 0, 0, 0, 0, 0, 130, 10],
+                           [0, 0, 0, 0, 0, 0, 0, 255, 0, 255]], dtype=np.uint8)
+        
+        result = renderer._convert_bit_depth(bitmap, 1, pack=True)
+        assert result.dtype == np.uint8
+        assert result.tolist() == [[0b10100000, 0b10000000],
+                                   [0b00000001, 0b01000000]]
+        
+        # Other depths are unaffected by pack
+        assert np.array_equal(renderer._convert_bit_depth(bitmap, 4, pack=True),
+                              bitmap >> 4)
+    
     def test_clear(self):
         """Test clearing font faces"""
         renderer = GlyphRenderer()
@@ -259,6 +294,41 @@ class TestGlyphRendererWithFont:
         assert glyph.char_code == 0x41
         assert glyph.mapped_code == 0xF000
     
+    def test_render_glyph_reuse_buffer(self, renderer_with_font):
+        """Test work-buffer rendering matches owned bitmaps"""
+        renderer, font_path = renderer_with_font
+        
+        for char_code in (0x41, 0x67, 0x20):
+            owned = renderer.render_glyph(font_path, char_code)
+            reused = renderer.render_glyph(font_path, char_code, reuse_buffer=True)
+            assert np.array_equal(reused.bitmap, owned.bitmap)
+            if reused.bitmap.size:
+                assert np.shares_memory(reused.bitmap, renderer._work_buf)
+    
+    def test_blank_bitmaps_shared(self):
+        """Test blank bitmaps are shared, read-only zero arrays"""
+        blank = _blank_bitmap(3, 5)
+        assert blank.shape == (3, 5)
+        assert not blank.any()
+        assert not blank.flags.writeable
+        assert _blank_bitmap(3, 5) is blank
+        assert _blank_bitmap(5, 3) is not blank
+    
+    def test_native_bitmap_is_view(self, renderer_with_font):
+        """Test FreeType bitmaps are wrapped without copying"""
+        renderer, font_path = renderer_with_font
+        face = renderer._faces[font_path]
+        face.load_char(0x41, renderer._load_flags(True))
+        bitmap = face.glyph.bitmap
+        
+        data = renderer._native_bitmap(bitmap)
+        assert data.shape == (bitmap.rows, bitmap.width)
+        assert not data.flags.owndata
+        if abs(bitmap.pitch) == bitmap.width:
+            assert data.flags.c_contiguous
+        assert data.tolist() == np.array(bitmap.buffer, dtype=np.uint8).reshape(
+            bitmap.rows, abs(bitmap.pitch))[:, :bitmap.width].tolist()
+    
     def test_get_kerning(self, renderer_with_font):
         """Test getting kerning information"""
         renderer, font_path = renderer_with_font
@@ -272,6 +342,54 @@ class TestGlyphRendererWithFont:
         assert isinstance(kern[0], int)
         assert isinstance(kern[1], int)
     
+    def test_kerning_cache_reset_on_size_change(self, renderer_with_font):
+        """Test kerning results are cached until the size changes"""
+        renderer, font_path = renderer_with_font
+        
+        kern = renderer.get_kerning(font_path, 0x41, 0x56)
+        assert renderer.get_kerning(font_path, 0x41, 0x56) == kern
+        
+        renderer.set_size(32)
+        assert len(renderer._kern_cache) == 0
+    
+    def test_set_size_skips_unchanged_faces(self, renderer_with_font):
+        """Test set_size only touches faces whose size changes"""
+        renderer, font_path = renderer_with_font
+        renderer.get_kerning(font_path, 0x41, 0x56)
+        face = renderer._faces[font_path]
+        calls = []
+        
+        class CountingFace:
+            size = property(lambda self: face.size)
+            
+            def set_pixel_sizes(self, width, height):
+                calls.append(height)
+                face.set_pixel_sizes(width, height)
+        
+        renderer._faces[font_path] = CountingFace()
+        
+        renderer.set_size(16)
+        assert calls == []
+        assert len(renderer._kern_cache) == 1
+        
+        renderer.set_size(20)
+        renderer.set_size(20)
+        assert calls == [20]
+        assert len(renderer._kern_cache) == 0
+    
+    def test_set_size_reapplies_foreign_resize(self, renderer_with_font):
+        """Test set_size restores the size when the face was resized elsewhere"""
+        renderer, font_path = renderer_with_font
+        face = renderer._faces[font_path]
+        height_16 = renderer.render_glyph(font_path, 0x41).height
+        
+        # Another user of the same face changes its size
+        face.set_pixel_sizes(0, 30)
+        
+        renderer.set_size(16)
+        assert face.size.y_ppem == 16
+        assert renderer.render_glyph(font_path, 0x41).height == height_16
+    
     def test_measure_text(self, renderer_with_font):
         """Test measuring text dimensions"""
         renderer, font_path = renderer_with_font
@@ -286,6 +404,30 @@ class TestGlyphRendererWithFont:
         width2, _ = renderer.measure_text(font_path, text * 2)
         assert width2 > width
     
+    def test_measure_texts(self, renderer_with_font):
+        """Test batch measurement matches measuring texts one by one"""
+        renderer, font_path = renderer_with_font
+        
+        texts = ["Hello", "World", ""]
+        results = renderer.measure_texts([(font_path, text) for text in texts])
+        
+        assert results == [renderer.measure_text(font_path, text) for text in texts]
+        
+        # Measurements match the rendered glyphs at several sizes
+        text = "Hello, World! gjpqy AVATAR 0123456789 ÀÉÎõü"
+        for size in (8, 11, 16, 24):
+            renderer.set_size(size)
+            glyphs = [renderer.render_glyph(font_path, ord(char)) for char in text]
+            kerning = sum(
+                renderer.get_kerning(font_path, ord(left), ord(right))[0]
+                for left, right in zip(text, text[1:])
+            )
+            expected = (
+                sum(glyph.advance_width for glyph in glyphs) + kerning,
+                max(glyph.height for glyph in glyphs)
+            )
+            assert renderer.measure_texts([(font_path, text)]) == [expected]
+    
     def test_measure_empty_text(self, renderer_with_font):
         """Test measuring empty text"""
         renderer, font_path = renderer_with_font
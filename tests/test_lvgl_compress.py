@@ -9,13 +9,16 @@ sys.path.insert(0, 'src')
 
 from writers.lvgl.compress import (
     compress_rle,
+    compress_rle_into,
     compress_rle_with_xor,
     decompress_rle,
     apply_xor_prefilter,
     count_same,
     calculate_compression_ratio,
+    rle_buffer_size,
     BitStream
 )
+from writers.lvgl import compress as compress_module
 
 
 class TestBitStream:
@@ -168,6 +171,44 @@ class TestCompressRLE:
             compress_rle(pixels, bpp=5)
 
 
+    @pytest.mark.skipif(compress_module._rle_encode_jit is None, reason="numba 未安装")
+    def test_jit_matches_python(self, monkeypatch):
+        """测试 numba 内核与纯 Python 实现输出一致"""
+        rng = np.random.default_rng(0)
+        for bpp in (1, 2, 3, 4):
+            values = rng.integers(0, 1 << bpp, 200, dtype=np.uint8)
+            pixels = np.repeat(values, rng.integers(1, 100, 200))
+            fast = compress_rle(pixels, bpp)
+            with monkeypatch.context() as m:
+                m.setattr(compress_module, '_rle_encode_jit', None)
+                assert compress_rle(pixels, bpp) == fast
+
+
+class TestCompressRLEInto:
+    """测试压缩到预分配缓冲区"""
+    
+    def test_matches_compress_rle(self):
+        """测试复用同一缓冲区时输出与 compress_rle 一致"""
+        rng = np.random.default_rng(1)
+        out = np.empty(rle_buffer_size(400, 4), dtype=np.uint8)
+        for bpp in (1, 2, 3, 4):
+            values = rng.integers(0, 1 << bpp, 40, dtype=np.uint8)
+            pixels = np.repeat(values, rng.integers(1, 10, 40))[:400]
+            size = compress_rle_into(pixels, bpp, out)
+            assert out[:size].tobytes() == compress_rle(pixels, bpp)
+    
+    def test_empty_input(self):
+        """测试空输入不写入任何字节"""
+        out = np.empty(4, dtype=np.uint8)
+        assert compress_rle_into(np.array([], dtype=np.uint8), 4, out) == 0
+    
+    def test_buffer_too_small(self):
+        """测试缓冲区不足时报错"""
+        pixels = np.arange(16, dtype=np.uint8)
+        with pytest.raises(ValueError):
+            compress_rle_into(pixels, 4, np.empty(2, dtype=np.uint8))
+
+
 class TestDecompressRLE:
     """测试 RLE 解压"""
     
@@ -248,6 +289,19 @@ class TestXORPrefilter:
         
         with pytest.raises(ValueError):
             apply_xor_prefilter(pixels)
+    
+    def test_out_buffer(self):
+        """测试写入调用方提供的缓冲区"""
+        pixels = np.array([
+            [15, 15],
+            [0, 3]
+        ], dtype=np.uint8)
+        out = np.empty_like(pixels)
+        
+        filtered = apply_xor_prefilter(pixels, out=out)
+        
+        assert np.shares_memory(filtered, out)
+        np.testing.assert_array_equal(filtered, [15, 15, 15, 12])
 
 
 class TestCompressRLEWithXOR:
@@ -296,6 +296,22 @@ class TestLVGLWriter:
         assert "0x55" in result
         assert result.count("\n") >= 1  # 至少有一个换行
     
+    def test_flatten_bitmap(self):
+        """测试无压缩位图按 bpp 紧凑打包 (MSB 优先)"""
+        writer = LVGLWriter()
+        
+        bitmap = np.array([[1, 2, 3], [4, 5, 6]], dtype=np.uint8)
+        assert writer._flatten_bitmap(bitmap, 8) == bytes([1, 2, 3, 4, 5, 6])
+        assert writer._flatten_bitmap(bitmap, 4) == bytes([0x12, 0x34, 0x56])
+        assert writer._flatten_bitmap(bitmap & 3, 2) == bytes([0x6C, 0x60])
+        assert writer._flatten_bitmap(bitmap & 1, 1) == bytes([0xA8])
+        
+        # 奇数像素数时末尾补零
+        assert writer._flatten_bitmap(np.array([[15, 1, 7]], dtype=np.uint8), 4) == bytes([0xF1, 0x70])
+        
+        with pytest.raises(ValueError):
+            writer._flatten_bitmap(bitmap, 3)
+    
     def test_cmap_format_to_enum(self):
         """测试 CmapFormat 转换"""
         writer = LVGLWriter()
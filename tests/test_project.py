@@ -0,0 +1,83 @@
+"""
+Unit tests for project module
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core import project as project_module
+from core.project import FontSource
+
+
+class TestFontSource:
+    """Test cases for FontSource"""
+    
+    def test_char_count(self):
+        """Test character count estimate from ranges and symbols"""
+        font = FontSource(
+            path="font.ttf",
+            ranges=["0x30-0x39", "0x41", "bad-range", "65-90"],
+            symbols="!@#"
+        )
+        assert font.char_count == 3 + 10 + 26
+    
+    def test_char_count_invalidated_on_assignment(self):
+        """Test cached count is refreshed when ranges/symbols change"""
+        font = FontSource(path="font.ttf", ranges=["0x30-0x39"], symbols="")
+        assert font.char_count == 10
+        
+        font.ranges = ["0x20-0x7E"]
+        assert font.char_count == 95
+        
+        font.symbols = "ab"
+        assert font.char_count == 97
+        
+        font.ranges.append("0x30-0x39")
+        assert font.recompute_char_count() == 107
+        assert font.char_count == 107
+    
+    def test_to_dict_display_name_follows_path(self):
+        """Test the default display name tracks path changes"""
+        font = FontSource(path="/fonts/Arial.ttf", ranges=[], symbols="")
+        assert font.to_dict()["display_name"] == "Arial"
+        
+        font.path = "/fonts/Roboto-Bold.ttf"
+        assert font.to_dict() == {
+            "path": "/fonts/Roboto-Bold.ttf",
+            "ranges": [],
+            "symbols": "",
+            "display_name": "Roboto-Bold",
+        }
+        
+        font.display_name = "Custom"
+        assert font.to_dict()["display_name"] == "Custom"
+        assert FontSource.from_dict(font.to_dict()) == font
+
+
+class TestProjectFile:
+    """Test cases for project file encoding"""
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_round_trip(self, monkeypatch, use_orjson):
+        """Test both JSON backends round-trip non-ASCII project data"""
+        if not use_orjson:
+            monkeypatch.setattr(project_module, 'orjson', None)
+        elif project_module.orjson is None:
+            pytest.skip("orjson not installed")
+        
+        data = {"version": "1.0", "fonts": [{"symbols": "©®™中文", "ranges": ["0x20-0x7E"]}]}
+        raw = project_module._dump_json(data)
+        assert isinstance(raw, bytes)
+        assert "中文".encode('utf-8') in raw
+        assert project_module._load_json(raw) == data
+    
+    def test_invalid_json_raises_decode_error(self):
+        """Test malformed files raise json.JSONDecodeError with either backend"""
+        with pytest.raises(json.JSONDecodeError):
+            project_module._load_json(b'{"version": ')
@@ -0,0 +1,134 @@
+"""
+Unit tests for range_parser module
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.range_parser import RangeParser, get_preset_range
+
+
+class TestParseUnicodePoint:
+    """Test cases for RangeParser.parse_unicode_point"""
+    
+    def test_hex(self):
+        """Test hex code points"""
+        assert RangeParser.parse_unicode_point("0x41") == 0x41
+        assert RangeParser.parse_unicode_point(" 0x1f450 ") == 0x1F450
+        assert RangeParser.parse_unicode_point("0X10FFFF") == 0x10FFFF
+    
+    def test_decimal(self):
+        """Test decimal code points"""
+        assert RangeParser.parse_unicode_point("65") == 65
+        assert RangeParser.parse_unicode_point("0") == 0
+    
+    def test_invalid_number(self):
+        """Test malformed numbers are rejected"""
+        for value in ["", "0x", "0xZZ", "0x+41", "0x4_1", "abc", "1.5"]:
+            with pytest.raises(ValueError, match="not a valid number"):
+                RangeParser.parse_unicode_point(value)
+    
+    def test_out_of_range(self):
+        """Test values outside the Unicode range are rejected"""
+        with pytest.raises(ValueError, match="out of Unicode range"):
+            RangeParser.parse_unicode_point("0x110000")
+        
+        with pytest.raises(ValueError, match="out of Unicode range"):
+            RangeParser.parse_unicode_point("-1")
+
+
+class TestParseRange:
+    """Test cases for RangeParser.parse_range"""
+    
+    def test_single(self):
+        """Test single character"""
+        assert RangeParser.parse_range("0x20") == [(0x20, 0x20, 0x20)]
+    
+    def test_range(self):
+        """Test character range"""
+        assert RangeParser.parse_range("0x20-0x7F") == [(0x20, 0x7F, 0x20)]
+    
+    def test_mapped(self):
+        """Test mapped character and mapped range"""
+        assert RangeParser.parse_range("0x1F450=>0xF005") == [(0x1F450, 0x1F450, 0xF005)]
+        assert RangeParser.parse_range("0x20-0x7F=>0x100") == [(0x20, 0x7F, 0x100)]
+    
+    def test_multiple(self):
+        """Test comma separated ranges with empty parts"""
+        assert RangeParser.parse_range("0x20-0x7F, 0x1F450,") == [
+            (0x20, 0x7F, 0x20),
+            (0x1F450, 0x1F450, 0x1F450),
+        ]
+    
+    def test_invalid(self):
+        """Test invalid ranges are rejected"""
+        with pytest.raises(ValueError, match="Invalid range"):
+            RangeParser.parse_range("0x7F-0x20")
+        
+        with pytest.raises(ValueError):
+            RangeParser.parse_range("0x20-")
+    
+    @pytest.mark.parametrize("part", ["0x20-", "-0x20", "=>0x20", "0x20=>", "0x20=0x30",
+                                      "0x20>0x30", "0x20-0x30=0x40"])
+    def test_malformed_parts(self, part):
+        """Test malformed parts report the offending part"""
+        with pytest.raises(ValueError, match="Invalid range format"):
+            RangeParser.parse_range(f"0x41,{part}")
+    
+    def test_whitespace_around_tokens(self):
+        """Test spaces around '-' and '=>' are ignored"""
+        assert RangeParser.parse_range(" 0x20 - 0x7F => 0x100 ") == [(0x20, 0x7F, 0x100)]
+
+
+class TestRangeHelpers:
+    """Test cases for range expansion and validation"""
+    
+    def test_expand_ranges(self):
+        """Test expanding ranges to (source, mapped) pairs"""
+        pairs = RangeParser.expand_ranges([(0x20, 0x22, 0x100), (0x41, 0x41, 0x41)])
+        assert pairs == [
+            (0x20, 0x100), (0x21, 0x101), (0x22, 0x102), (0x41, 0x41)
+        ]
+        assert RangeParser.expand_ranges([]) == []
+    
+    def test_get_character_set(self):
+        """Test collecting source characters"""
+        chars = RangeParser.get_character_set([(0x20, 0x22, 0x100), (0x21, 0x23, 0x21)])
+        assert chars == {0x20, 0x21, 0x22, 0x23}
+        assert -1 not in chars
+    
+    def test_validate_overlap(self):
+        """Test overlapping ranges are reported"""
+        warnings = RangeParser.validate_ranges(RangeParser.parse_range("0x20-0x7F,0x30-0x39"))
+        assert any("Overlapping" in w for w in warnings)
+        
+        assert RangeParser.validate_ranges(RangeParser.parse_range("0x20-0x2F,0x30-0x39")) == []
+        
+        # Overlap with a range that is not the previous one in input order
+        warnings = RangeParser.validate_ranges([(0x30, 0x39, 0x30), (0x20, 0x7F, 0x20)])
+        assert any("Overlapping" in w for w in warnings)
+        assert RangeParser.validate_ranges([(0x10FFFF, 0x10FFFF, 0x10FFFF), (0x0, 0x0, 0x0)]) == []
+    
+    def test_validate_large_counts_unique(self):
+        """Test the large set check counts overlapping characters once"""
+        warnings = RangeParser.validate_ranges([(0x4E00, 0x6DFF, 0x4E00)] * 3)
+        assert not any("Large character set" in w for w in warnings)
+        
+        warnings = RangeParser.validate_ranges([(0x4E00, 0x9FFF, 0x4E00), (0x6000, 0xA0FF, 0x6000)])
+        assert "Warning: Large character set (21248 characters)" in warnings
+    
+    def test_validate_large(self):
+        """Test large character sets are reported"""
+        warnings = RangeParser.validate_ranges(
+            RangeParser.parse_range(get_preset_range('CJK_UNIFIED_COMMON'))
+        )
+        assert any("Large character set" in w for w in warnings)
+
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, "-v"])
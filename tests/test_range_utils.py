@@ -0,0 +1,54 @@
+"""
+Unit tests for the simple converter's range helpers
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core._range_utils import parse_range, collect_codepoints, estimate_char_count
+
+
+class TestParseRange:
+    """Test cases for parse_range"""
+
+    def test_ranges(self):
+        """Test hex and decimal ranges are inclusive"""
+        assert list(parse_range("0x30-0x39")) == list(range(0x30, 0x3A))
+        assert list(parse_range("48 - 57")) == list(range(48, 58))
+
+    def test_single(self):
+        """Test single code points, including leading zeros"""
+        assert list(parse_range("0x41")) == [0x41]
+        assert list(parse_range(" 065 ")) == [65]
+
+    def test_invalid(self):
+        """Test unparsable strings yield nothing"""
+        assert list(parse_range("abc")) == []
+
+
+class TestCollectCodepoints:
+    """Test cases for collect_codepoints"""
+
+    def test_ranges_and_symbols(self):
+        """Test ranges and symbols are merged without duplicates"""
+        codepoints = collect_codepoints(["0x41-0x43", "0x42"], "AZ©")
+        assert codepoints == {0x41, 0x42, 0x43, ord("Z"), ord("©")}
+
+    def test_astral_symbols(self):
+        """Test symbols outside the BMP map to a single code point"""
+        assert collect_codepoints([], "\U0001F600\u4E2D\U0001F600") == {0x1F600, 0x4E2D}
+
+    def test_lone_surrogate_symbols(self):
+        """Test lone surrogates in symbols are kept as their code points"""
+        assert collect_codepoints([], "A\ud800\udfff") == {0x41, 0xD800, 0xDFFF}
+
+
+class TestEstimateCharCount:
+    """Test cases for estimate_char_count"""
+
+    def test_ranges_and_symbols(self):
+        """Test range lengths and symbols are summed, unparsable ranges skipped"""
+        assert estimate_char_count(["0x30-0x39", "65-90", "0x41", "x-y"], "©®") == 10 + 26 + 2
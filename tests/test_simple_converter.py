@@ -0,0 +1,89 @@
+"""
+Unit tests for SimpleFontConverter
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.simple_converter import SimpleFontConverter
+
+
+@pytest.fixture
+def system_font_path():
+    """Find a system font for testing"""
+    possible_fonts = [
+        # Linux
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        # macOS
+        "/Library/Fonts/Arial.ttf",
+        # Windows (if running in WSL)
+        "/mnt/c/Windows/Fonts/arial.ttf",
+    ]
+
+    for font_path in possible_fonts:
+        if Path(font_path).exists():
+            return font_path
+
+    pytest.skip("No suitable system font found")
+
+
+def _convert(converter, font_path, size, output_dir, ranges=("0x41-0x5A",)):
+    """Convert A-Z (by default) at the given size and return the generated C source"""
+    output_path = str(output_dir / f"font_{size}")
+    assert converter.convert_font(
+        font_path=font_path,
+        ranges=list(ranges),
+        symbols="",
+        size=size,
+        bpp=4,
+        output_path=output_path,
+    )
+    return Path(f"{output_path}.c").read_text(encoding='utf-8')
+
+
+class TestSimpleFontConverter:
+    """Test cases for SimpleFontConverter"""
+
+    def test_reconvert_after_face_resized(self, system_font_path, tmp_path):
+        """Test a cached font is converted at the requested size even if its face was resized"""
+        converter = SimpleFontConverter(jobs=1)
+        first = _convert(converter, system_font_path, 16, tmp_path)
+
+        # Resize the cached face behind the converter's back
+        (font_loader, _, _), = converter._font_cache.values()
+        font_loader.get_freetype_face(system_font_path).set_pixel_sizes(0, 30)
+
+        assert _convert(converter, system_font_path, 16, tmp_path) == first
+
+    def test_converters_do_not_interfere(self, system_font_path, tmp_path):
+        """Test converting the same font at another size in a second converter"""
+        converter = SimpleFontConverter(jobs=1)
+        first = _convert(converter, system_font_path, 16, tmp_path)
+
+        _convert(SimpleFontConverter(jobs=1), system_font_path, 30, tmp_path)
+
+        assert _convert(converter, system_font_path, 16, tmp_path) == first
+
+    def test_parallel_matches_serial(self, system_font_path, tmp_path):
+        """Test multi-threaded rendering produces the same output as serial rendering"""
+        ranges = ("0x20-0x7FF",)
+        serial = _convert(SimpleFontConverter(jobs=1), system_font_path, 16, tmp_path, ranges)
+
+        assert _convert(SimpleFontConverter(jobs=4), system_font_path, 16, tmp_path, ranges) == serial
+
+    def test_close_releases_fonts(self, system_font_path, tmp_path):
+        """Test close() unloads cached fonts and closes their faces"""
+        converter = SimpleFontConverter(jobs=1)
+        _convert(converter, system_font_path, 16, tmp_path)
+        (font_loader, _, _), = converter._font_cache.values()
+        face = font_loader.get_freetype_face(system_font_path)
+
+        converter.close()
+        assert not converter._font_cache
+        assert face._FT_Face is None